@@ -0,0 +1,89 @@
+"""Fast read-only yaml loading.
+
+Uses the LibYAML backed loader of PyYAML when available. yamlium is still used wherever a
+yaml file is written back, since it preserves comments and formatting.
+"""
+
+from pathlib import Path
+from typing import Any, ClassVar
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without LibYAML
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+
+def _parse_plain_scalar(value: str, /) -> str | int | float | bool | None:
+    """Type an unquoted scalar the same way as yamlium.
+
+    Unlike the YAML 1.1 rules of PyYAML, yes/on/no/off and dates stay strings, 010 is 10 and
+    1e3 is a float.
+    """
+    lower_value = value.lower()
+    if lower_value in ("", "null", "~"):
+        return None
+    if lower_value in ("true", "false"):
+        return lower_value == "true"
+    try:
+        return int(lower_value)
+    except ValueError:
+        pass
+    try:
+        return float(lower_value)
+    except ValueError:
+        return value
+
+
+class _Loader(_SafeLoader):
+    """Safe loader that types and parses scalars the same way as yamlium."""
+
+    # Resolve every plain scalar as a string, construct_yaml_str types them like yamlium.
+    # Only the merge key resolver is kept, so "<<: *anchor" is still merged.
+    yaml_implicit_resolvers: ClassVar[dict] = {
+        "<": [
+            (tag, regexp)
+            for tag, regexp in _SafeLoader.yaml_implicit_resolvers["<"]
+            if tag == "tag:yaml.org,2002:merge"
+        ]
+    }
+
+    def construct_yaml_str(self, node: yaml.ScalarNode) -> Any:  # noqa: ANN401
+        """Construct a string, or the typed value of an unquoted scalar."""
+        value = self.construct_scalar(node)
+        return value if node.style else _parse_plain_scalar(value)
+
+    def construct_scalar(self, node: yaml.ScalarNode) -> Any:  # noqa: ANN401
+        """Strip the trailing newline of literal and folded block scalars."""
+        value = super().construct_scalar(node)
+        return value.rstrip("\n") if node.style in ("|", ">") else value
+
+
+_Loader.add_constructor("tag:yaml.org,2002:str", _Loader.construct_yaml_str)
+
+
+def parse_yaml(text: str | bytes, /) -> dict[str, Any]:
+    """Parse yaml text into plain python objects.
+
+    Args:
+        text: The yaml document.
+
+    Returns:
+        The parsed yaml mapping, empty if the document is empty.
+
+    """
+    return yaml.load(text, Loader=_Loader) or {}  # noqa: S506
+
+
+def read_yaml(path: Path, /) -> dict[str, Any]:
+    """Read a yaml file into plain python objects.
+
+    Args:
+        path: Path to the yaml file.
+
+    Returns:
+        The parsed yaml mapping, empty if the file is empty.
+
+    """
+    return parse_yaml(path.read_bytes())
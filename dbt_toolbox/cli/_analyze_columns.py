@@ -1,12 +1,14 @@
 """Module for analyzing column references in models."""
 
+from collections import defaultdict
 from dataclasses import dataclass
+from hashlib import blake2b
 
-from dbt_toolbox.column_resolver import ColumnReference, TableType
+from dbt_toolbox.column_resolver import TableType
 from dbt_toolbox.data_models import Model, Seed, Source
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ColumnAnalysis:
     """Results of column reference analysis."""
 
@@ -17,142 +19,123 @@ class ColumnAnalysis:
 
 def _analyze_model_column_references(
     model: Model,
-    models: dict[str, Model],
-    sources: dict[str, Source],
-    seeds: dict[str, Seed],
-) -> tuple[dict[str, list[str]], list[str], dict[str, list[str]]]:
+    available_columns: dict[str, frozenset[str] | None],
+    refs_by_target: defaultdict[str, list[tuple[str, str]]],
+) -> tuple[list[str], dict[str, list[str]]]:
     """Analyze column references for a single model.
 
+    Column references to existing models and sources are not validated here,
+    they are collected into refs_by_target to be checked per referenced object.
+
     Args:
         model: Model to analyze
-        models: Dictionary of model name to Model objects
-        sources: Dictionary of source full_name to Source objects
-        seeds: Dictionary of seed name to Seed objects
+        available_columns: Columns of every model, source and seed by name,
+            None when the columns can't be validated.
+        refs_by_target: Referenced object -> list of (model name, column name)
 
     Returns:
-        Tuple of (non_existent_columns, non_existent_references, cte_issues)
+        Tuple of (non_existent_references, cte_issues)
 
     """
-    model_non_existent_cols = {}
-    model_non_existent_refs = []
-    model_cte_issues = {}
+    model_non_existent_refs: list[str] = []
+    model_cte_issues: defaultdict[str, list[str]] = defaultdict(list)
 
-    if model.column_references is None or len(model.column_references) == 0:
+    if not model.column_references:
         # Column resolver failed or returned empty results (e.g., due to SELECT *)
         # For now, skip analysis for these models
         # TODO: Enhance column resolver to handle SELECT * and complex CTE chains
-        return model_non_existent_cols, model_non_existent_refs, model_cte_issues
+        return model_non_existent_refs, {}
 
     for col_ref in model.column_references:
+        referenced_model = col_ref.table
         # Only analyze references that have a table
-        if col_ref.table is None:
+        if referenced_model is None:
             continue
 
-        referenced_model = col_ref.table
-
         # Handle CTE references
         if col_ref.reference_type == TableType.CTE:
-            available_objects = {"models": models, "sources": sources, "seeds": seeds}
-            handled_as_cte = _handle_cte_reference(
-                col_ref, referenced_model, model_cte_issues, available_objects
-            )
-            if handled_as_cte:
+            if col_ref.resolved is not False:
+                continue
+            if referenced_model not in available_columns:
+                # A genuine CTE column issue
+                cte_issues = model_cte_issues[referenced_model]
+                if col_ref.name not in cte_issues:
+                    cte_issues.append(col_ref.name)
                 continue
-            # If not handled as CTE, fall through to external reference handling
+            # The CTE shadows an existing model/source/seed, this might be
+            # a SELECT * CTE that should be validated externally.
 
         # Handle external references (models, sources, seeds)
-        available_objects = {"models": models, "sources": sources, "seeds": seeds}
-        _handle_external_reference(
-            col_ref,
-            referenced_model,
-            available_objects,
-            model_non_existent_cols,
-            model_non_existent_refs,
-        )
+        if referenced_model not in available_columns:
+            if referenced_model not in model_non_existent_refs:
+                model_non_existent_refs.append(referenced_model)
+            continue
 
-    return model_non_existent_cols, model_non_existent_refs, model_cte_issues
+        refs_by_target[referenced_model].append((model.name, col_ref.name))
 
+    return model_non_existent_refs, dict(model_cte_issues)
 
-def _handle_cte_reference(
-    col_ref: ColumnReference,
-    referenced_model: str,
-    model_cte_issues: dict[str, list[str]],
-    available_objects: dict,
-) -> bool:
-    """Handle CTE column reference validation.
+
+def _find_non_existent_columns(
+    refs_by_target: dict[str, list[tuple[str, str]]],
+    available_columns: dict[str, frozenset[str] | None],
+) -> dict[str, dict[str, list[str]]]:
+    """Find referenced columns that don't exist, grouped by referenced object.
+
+    Args:
+        refs_by_target: Referenced object -> list of (model name, column name)
+        available_columns: Columns of every model, source and seed by name,
+            None when the columns can't be validated.
 
     Returns:
-        True if handled as CTE issue, False if should be handled as external reference
+        Dictionary of {model_name: {referenced_model: [missing_columns]}}
 
     """
-    if col_ref.resolved is False:
-        # Check if this might be a SELECT * CTE that should validate externally
-        models = available_objects["models"]
-        sources = available_objects["sources"]
-        seeds = available_objects["seeds"]
-
-        # If the referenced_model exists as an external model/source/seed,
-        # then this might be a SELECT * CTE that should be validated externally
-        if referenced_model in models or referenced_model in sources or referenced_model in seeds:
-            return False  # Let it be handled as external reference
-
-        # Otherwise, this is a genuine CTE column issue
-        if referenced_model not in model_cte_issues:
-            model_cte_issues[referenced_model] = []
-        if col_ref.name not in model_cte_issues[referenced_model]:
-            model_cte_issues[referenced_model].append(col_ref.name)
-
-    return True  # Handled as CTE issue
-
-
-def _handle_external_reference(
-    col_ref: ColumnReference,
-    referenced_model: str,
-    available_objects: dict,
-    model_non_existent_cols: dict[str, list[str]],
-    model_non_existent_refs: list[str],
-) -> None:
-    """Handle external model/source/seed reference validation."""
-    models = available_objects["models"]
-    sources = available_objects["sources"]
-    seeds = available_objects["seeds"]
-
-    # Check if referenced model exists
-    if (
-        referenced_model not in models
-        and referenced_model not in sources
-        and referenced_model not in seeds
-    ):
-        if referenced_model not in model_non_existent_refs:
-            model_non_existent_refs.append(referenced_model)
-        return
-
-    # Check if column exists in referenced model
-    column_exists = _check_column_exists(col_ref.name, referenced_model, models, sources, seeds)
-
-    if not column_exists:
-        if referenced_model not in model_non_existent_cols:
-            model_non_existent_cols[referenced_model] = []
-        if col_ref.name not in model_non_existent_cols[referenced_model]:
-            model_non_existent_cols[referenced_model].append(col_ref.name)
-
-
-def _check_column_exists(
-    column_name: str,
-    referenced_model: str,
+    non_existent_columns: defaultdict[str, dict[str, list[str]]] = defaultdict(dict)
+    for referenced_model, refs in refs_by_target.items():
+        columns = available_columns[referenced_model]
+        if columns is None:
+            continue
+        # Diff all referenced columns at once, then hand the missing ones back to the models
+        missing = {column_name for _, column_name in refs} - columns
+        if not missing:
+            continue
+        for model_name, column_name in refs:
+            if column_name not in missing:
+                continue
+            missing_columns = non_existent_columns[model_name].setdefault(referenced_model, [])
+            if column_name not in missing_columns:
+                missing_columns.append(column_name)
+    return non_existent_columns
+
+
+def analysis_signature(
     models: dict[str, Model],
     sources: dict[str, Source],
     seeds: dict[str, Seed],
-) -> bool:
-    """Check if a column exists in the referenced model/source/seed."""
-    if referenced_model in seeds:
-        # For seeds, we can't validate columns since we don't parse CSV headers
-        return True
-    if referenced_model in models:
-        return column_name in models[referenced_model].final_columns
-    if referenced_model in sources:
-        return column_name in sources[referenced_model].compiled_columns
-    return False
+    dialect: str,
+) -> str:
+    """Build a content hash of everything the column analysis depends on.
+
+    Args:
+        models: Dictionary of model name to Model objects
+        sources: Dictionary of source full_name to Source objects
+        seeds: Dictionary of seed name to Seed objects
+        dialect: The sql dialect the models were parsed with
+
+    Returns:
+        Hex digest identifying the inputs of the analysis.
+
+    """
+    signature = blake2b(digest_size=16)
+    signature.update(f"dialect:{dialect}\0".encode())
+    for name, model in sorted(models.items()):
+        signature.update(f"model:{name}\0{model.rendered_code}\0".encode())
+    for name, source in sorted(sources.items()):
+        signature.update(f"source:{name}\0{','.join(source.compiled_columns)}\0".encode())
+    for name in sorted(seeds):
+        signature.update(f"seed:{name}\0".encode())
+    return signature.hexdigest()
 
 
 def analyze_column_references(
@@ -174,31 +157,36 @@ def analyze_column_references(
         - cte_column_issues: {model_name: {cte_name: [missing_columns]}}
 
     """
-    non_existent_columns = {}
     referenced_non_existent_models = {}
     cte_column_issues = {}
+    refs_by_target: defaultdict[str, list[tuple[str, str]]] = defaultdict(list)
+    # Precompute column sets once, seeds take precedence over models over sources.
+    available_columns: dict[str, frozenset[str] | None] = {
+        **{name: frozenset(source.compiled_columns) for name, source in sources.items()},
+        **{name: frozenset(model.final_columns) for name, model in models.items()},
+        # For seeds, we can't validate columns since we don't parse CSV headers
+        **dict.fromkeys(seeds),
+    }
 
     for model_name, model in models.items():
-        (model_non_existent_cols, model_non_existent_refs, model_cte_issues) = (
-            _analyze_model_column_references(
-                model,
-                models,
-                sources,
-                seeds,
-            )
+        model_non_existent_refs, model_cte_issues = _analyze_model_column_references(
+            model, available_columns, refs_by_target
         )
 
-        if model_non_existent_cols:
-            non_existent_columns[model_name] = model_non_existent_cols
-
         if model_non_existent_refs:
             referenced_non_existent_models[model_name] = model_non_existent_refs
 
         if model_cte_issues:
             cte_column_issues[model_name] = model_cte_issues
 
+    # Check all references to the same object against its columns in one go
+    non_existent_columns = _find_non_existent_columns(refs_by_target, available_columns)
+
     return ColumnAnalysis(
-        non_existent_columns=non_existent_columns,
+        # Keep the models ordering
+        non_existent_columns={
+            name: non_existent_columns[name] for name in models if name in non_existent_columns
+        },
         referenced_non_existent_models=referenced_non_existent_models,
         cte_column_issues=cte_column_issues,
     )
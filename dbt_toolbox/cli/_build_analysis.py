@@ -1,6 +1,6 @@
 """Build analysis logic for intelligent execution."""
 
-import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import NamedTuple
@@ -11,6 +11,16 @@ from dbt_toolbox.dbt_parser.dbt_parser import dbt_parser
 from dbt_toolbox.settings import settings
 from dbt_toolbox.utils import printer
 
+UTC = timezone.utc
+
+# Summary output, formatted once per print
+_HEADER = "🔍 Build Execution Analysis"
+_TOTAL_FMT = "   📊 Total models in selection: {}"
+_EXECUTE_FMT = "   ✅ Models to execute: {}"
+_SKIP_FMT = "   ⏭️  Models to skip: {}"
+_EXECUTE_HEADER = "\n📋 Models requiring execution:"
+_SKIP_HEADER = "\n⏭️  Models with valid cache (skipping):"
+
 
 class ExecutionReason(NamedTuple):
     """Reason why a model needs execution."""
@@ -19,17 +29,17 @@ class ExecutionReason(NamedTuple):
     description: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelExecutionAnalysis:
     """Analysis result for a model's execution necessity."""
 
     model: Model
-    needs_execution: bool
     reasons: list[ExecutionReason]
 
-    def __post_init__(self) -> None:
-        """Ensure consistency between needs_execution and reasons."""
-        self.needs_execution = len(self.reasons) > 0
+    @property
+    def needs_execution(self) -> bool:
+        """A model needs execution if there is any reason for it."""
+        return bool(self.reasons)
 
 
 class BuildAnalyzer:
@@ -37,13 +47,38 @@ class BuildAnalyzer:
 
     def __init__(self) -> None:
         """Initialize the build analyzer."""
-        # Don't cache the validity delta to allow for dynamic updates
+        # Memoized graph traversals, keyed on (graph version, name)
+        self._upstream_cache: dict[tuple[int, str], frozenset[str]] = {}
+        self._downstream_cache: dict[tuple[int, str], frozenset[str]] = {}
+        self._selection_cache: dict[tuple[int, str], frozenset[str]] = {}
+        # Per analysis pass caches, only set during analyze_build_execution
+        self._macro_changed_cache: dict[str, bool] | None = None
+        self._is_fresh_cache: dict[str, bool] | None = None
 
     @property
     def cache_expiration(self) -> datetime:
         """Get the current cache validity delta."""
         return EXECUTION_TIMESTAMP - timedelta(minutes=settings.cache_validity_minutes)
 
+    def _upstream_models(self, model_name: str) -> frozenset[str]:
+        """Get all upstream models (not macros) of a model, memoized per graph version."""
+        key = (dbt_parser.current_graph_version(), model_name)
+        if key not in self._upstream_cache:
+            # Every model is a graph node, so intersecting with the model names drops the macros
+            self._upstream_cache[key] = frozenset(
+                dbt_parser.model_names & dbt_parser.dependency_graph.get_upstream_nodes(model_name)
+            )
+        return self._upstream_cache[key]
+
+    def _downstream_models(self, model_name: str) -> frozenset[str]:
+        """Get all downstream models of a model, memoized per graph version."""
+        key = (dbt_parser.current_graph_version(), model_name)
+        if key not in self._downstream_cache:
+            self._downstream_cache[key] = frozenset(
+                m.name for m in dbt_parser.get_downstream_models(model_name)
+            )
+        return self._downstream_cache[key]
+
     def parse_dbt_selection(self, selection: str | None) -> set[str]:
         """Parse dbt model selection syntax to get target models.
 
@@ -56,86 +91,90 @@ class BuildAnalyzer:
         """
         if not selection:
             # No selection means all models
-            return set(dbt_parser.models.keys())
+            return set(dbt_parser.model_names)
 
+        key = (dbt_parser.current_graph_version(), selection)
+        if key not in self._selection_cache:
+            self._selection_cache[key] = frozenset(self._resolve_selection(selection))
+        return set(self._selection_cache[key])
+
+    def _resolve_selection(self, selection: str) -> set[str]:
+        """Resolve a dbt selection string into model names, without memoization."""
         target_models = set()
+        model_names = dbt_parser.model_names
+        get_upstream = self._upstream_models
+        get_downstream = self._downstream_models
 
         # Handle multiple selections separated by comma or space
-        selections = re.split(r"[,\s]+", selection.strip())
-
-        for sel in selections:
-            if not sel:
+        for sel in selection.replace(",", " ").split():
+            # Parse selection patterns: "+model", "model+" and "+model+"
+            upstream = sel.startswith("+")
+            downstream = sel.endswith("+")
+            model_name = sel.strip("+")
+            if model_name not in model_names:
                 continue
-
-            # Parse selection patterns
-            if sel.endswith("+"):
-                # downstream selection: "model+"
-                model_name = sel[:-1]
-                if model_name in dbt_parser.models:
-                    target_models.add(model_name)
-                    # Add all downstream models
-                    downstream_models = dbt_parser.get_downstream_models(model_name)
-                    target_models.update(m.name for m in downstream_models)
-            elif sel.startswith("+"):
-                # upstream selection: "+model"
-                model_name = sel[1:]
-                if model_name in dbt_parser.models:
-                    target_models.add(model_name)
-                    # Add all upstream models
-                    upstream_nodes = dbt_parser.dependency_graph.get_upstream_nodes(model_name)
-                    # Filter to only models (not macros)
-                    upstream_models = [
-                        node
-                        for node in upstream_nodes
-                        if dbt_parser.dependency_graph.get_node_type(node) == "model"
-                    ]
-                    target_models.update(upstream_models)
-            elif "+" in sel:
-                # bidirectional selection: "+model+" or complex patterns
-                parts = sel.split("+")
-                if len(parts) == 3 and parts[0] == "" and parts[2] == "":  # noqa: PLR2004
-                    # "+model+" pattern
-                    model_name = parts[1]
-                    if model_name in dbt_parser.models:
-                        target_models.add(model_name)
-                        # Add upstream
-                        upstream_nodes = dbt_parser.dependency_graph.get_upstream_nodes(model_name)
-                        upstream_models = [
-                            node
-                            for node in upstream_nodes
-                            if dbt_parser.dependency_graph.get_node_type(node) == "model"
-                        ]
-                        target_models.update(upstream_models)
-                        # Add downstream
-                        downstream_models = dbt_parser.get_downstream_models(model_name)
-                        target_models.update(m.name for m in downstream_models)
-            # direct model selection
-            elif sel in dbt_parser.models:
-                target_models.add(sel)
+            target_models.add(model_name)
+            if upstream:
+                target_models.update(get_upstream(model_name))
+            if downstream:
+                target_models.update(get_downstream(model_name))
 
         return target_models
 
+    def _model_is_fresh(self, model_name: str) -> bool:
+        """Check model freshness, reusing results within one analysis pass."""
+        if self._is_fresh_cache is None:
+            return dbt_parser.models[model_name].is_fresh
+        if model_name not in self._is_fresh_cache:
+            self._is_fresh_cache[model_name] = dbt_parser.models[model_name].is_fresh
+        return self._is_fresh_cache[model_name]
+
+    def _macro_changed(self, macro_name: str) -> bool:
+        """Check whether a macro changed, reusing results within one analysis pass."""
+        if self._macro_changed_cache is None:
+            return dbt_parser.macro_changed(macro_name)
+        if macro_name not in self._macro_changed_cache:
+            self._macro_changed_cache[macro_name] = dbt_parser.macro_changed(macro_name)
+        return self._macro_changed_cache[macro_name]
+
+    def _iter_upstream_models_changed(self, model: Model) -> Iterator[str]:
+        """Lazily yield the upstream models that have changed."""
+        model_names = dbt_parser.model_names
+        is_fresh = self._model_is_fresh
+        return (m for m in model.upstream.models if m in model_names and not is_fresh(m))
+
+    def _iter_upstream_macros_changed(self, model: Model) -> Iterator[str]:
+        """Lazily yield the upstream macros that have changed."""
+        macro_changed = self._macro_changed
+        return (macro_name for macro_name in model.upstream.macros if macro_changed(macro_name))
+
     def upstream_models_changed(self, model: Model) -> list[str]:
         """Get list of upstream models that have changed."""
-        return [
-            m
-            for m in model.upstream.models
-            if m in dbt_parser.models and not dbt_parser.models[m].is_fresh
-        ]
+        return list(self._iter_upstream_models_changed(model))
 
     def upstream_macros_changed(self, model: Model) -> list[str]:
         """Get list of upstream macros that have changed."""
-        return [
-            macro_name
-            for macro_name in model.upstream.macros
-            if dbt_parser.macro_changed(macro_name)
-        ]
+        return list(self._iter_upstream_macros_changed(model))
+
+    @staticmethod
+    def _changed(changed: Iterator[str], needs_reasons: bool) -> list[str]:
+        """Collect changed upstream names, only up to the first one if reasons aren't needed."""
+        first = next(changed, None)
+        if first is None:
+            return []
+        return [first, *changed] if needs_reasons else [first]
 
-    def analyze_model_execution(self, model: Model) -> ModelExecutionAnalysis:
+    def analyze_model_execution(
+        self,
+        model: Model,
+        needs_reasons: bool = True,
+    ) -> ModelExecutionAnalysis:
         """Analyze if a model needs execution and why.
 
         Args:
             model: The model to analyze.
+            needs_reasons: Whether to collect every reason, when False the analysis
+                stops at the first reason found.
 
         Returns:
             ModelExecutionAnalysis with execution decision and reasons.
@@ -152,9 +191,14 @@ class BuildAnalyzer:
                     f"timed out ({settings.cache_validity_minutes}min limit)",
                 ),
             )
+            if not needs_reasons:
+                return ModelExecutionAnalysis(model=model, reasons=reasons)
 
         # Check condition 3: Upstream models changed
-        changed_upstream_models = self.upstream_models_changed(model)
+        changed_upstream_models = self._changed(
+            self._iter_upstream_models_changed(model),
+            needs_reasons,
+        )
         if changed_upstream_models:
             reasons.append(
                 ExecutionReason(
@@ -162,9 +206,14 @@ class BuildAnalyzer:
                     description=f"Upstream models changed: {', '.join(changed_upstream_models)}",
                 ),
             )
+            if not needs_reasons:
+                return ModelExecutionAnalysis(model=model, reasons=reasons)
 
         # Check condition 4: Upstream macros changed
-        changed_upstream_macros = self.upstream_macros_changed(model)
+        changed_upstream_macros = self._changed(
+            self._iter_upstream_macros_changed(model),
+            needs_reasons,
+        )
         if changed_upstream_macros:
             reasons.append(
                 ExecutionReason(
@@ -173,37 +222,71 @@ class BuildAnalyzer:
                 ),
             )
 
-        return ModelExecutionAnalysis(
-            model=model,
-            needs_execution=(len(reasons) > 0),
-            reasons=reasons,
-        )
+        return ModelExecutionAnalysis(model=model, reasons=reasons)
 
     def analyze_build_execution(
         self,
         selection: str | None = None,
+        needs_reasons: bool = True,
     ) -> dict[str, ModelExecutionAnalysis]:
         """Analyze which models need execution for a build command.
 
         Args:
             selection: dbt selection string (e.g., "my_model+")
+            needs_reasons: Whether to collect every execution reason per model,
+                when False only the first reason found is kept.
 
         Returns:
             Dictionary mapping model names to their execution analysis.
 
         """
+        if not selection and self._project_unchanged():
+            # Nothing changed since the last analysis found all models fresh
+            return {
+                name: ModelExecutionAnalysis(model=model, reasons=[])
+                for name, model in dbt_parser.models.items()
+            }
+
         # Get target models from dbt selection
         target_models = self.parse_dbt_selection(selection)
 
-        # Analyze each target model
-        analysis_results = {}
-        for model_name in target_models:
-            if model_name in dbt_parser.models:
-                model = dbt_parser.models[model_name]
-                analysis_results[model_name] = self.analyze_model_execution(model)
-
+        # Many models share upstream models and macros, only check each once per pass
+        self._macro_changed_cache = {}
+        self._is_fresh_cache = {}
+        models = [dbt_parser.models[name] for name in target_models if name in dbt_parser.models]
+        try:
+            analysis_results = {
+                model.name: self.analyze_model_execution(model, needs_reasons=needs_reasons)
+                for model in models
+            }
+        finally:
+            self._macro_changed_cache = None
+            self._is_fresh_cache = None
+
+        if not selection and models:
+            self._remember_fresh_project(models, analysis_results)
         return analysis_results
 
+    def _project_unchanged(self) -> bool:
+        """Check whether the project is unchanged since it was last found fully fresh."""
+        last_manifest = dbt_parser.cache.cache_last_manifest.read()
+        if not last_manifest:
+            return False
+        manifest_hash, fresh_until = last_manifest
+        return manifest_hash == dbt_parser.manifest_hash and fresh_until >= EXECUTION_TIMESTAMP
+
+    def _remember_fresh_project(
+        self,
+        models: list[Model],
+        analyses: dict[str, ModelExecutionAnalysis],
+    ) -> None:
+        """Store the manifest hash if no model needs execution, until the first cache expires."""
+        if any(a.needs_execution for a in analyses.values()):
+            return
+        validity = timedelta(minutes=settings.cache_validity_minutes)
+        fresh_until = min(m.last_built for m in models if m.last_built is not None) + validity
+        dbt_parser.cache.cache_last_manifest.write((dbt_parser.manifest_hash, fresh_until))
+
     def print_execution_analysis(
         self,
         analyses: dict[str, ModelExecutionAnalysis],
@@ -216,27 +299,33 @@ class BuildAnalyzer:
             verbose: Whether to list all models that need execution.
 
         """
-        total_models = len(analyses)
-        models_to_execute = sum(1 for a in analyses.values() if a.needs_execution)
-        models_to_skip = total_models - models_to_execute
-
-        printer.cprint("🔍 Build Execution Analysis", color="cyan")
-        printer.cprint(f"   📊 Total models in selection: {total_models}")
-        printer.cprint(f"   ✅ Models to execute: {models_to_execute}")
-        printer.cprint(f"   ⏭️  Models to skip: {models_to_skip}")
-
-        if verbose and models_to_execute > 0:
-            printer.cprint("\n📋 Models requiring execution:", color="yellow")
-            for model_name, analysis in analyses.items():
-                if analysis.needs_execution:
+        with printer.cbuffered():
+            # Partition the analyses in a single pass
+            to_execute: list[tuple[str, ModelExecutionAnalysis]] = []
+            to_skip: list[tuple[str, ModelExecutionAnalysis]] = []
+            for item in analyses.items():
+                (to_execute if item[1].needs_execution else to_skip).append(item)
+            total_models = len(analyses)
+            models_to_execute = len(to_execute)
+            models_to_skip = len(to_skip)
+
+            printer.cprint(_HEADER, color="cyan")
+            printer.cprint(_TOTAL_FMT.format(total_models))
+            printer.cprint(_EXECUTE_FMT.format(models_to_execute))
+            printer.cprint(_SKIP_FMT.format(models_to_skip))
+
+            if verbose and models_to_execute > 0:
+                printer.cprint(_EXECUTE_HEADER, color="yellow")
+                for model_name, analysis in to_execute:
                     printer.cprint(f"  • {model_name}")
                     for reason in analysis.reasons:
                         printer.cprint(f"    - {reason.description}", color="bright_black")
 
-        if verbose and models_to_skip > 0:
-            printer.cprint("\n⏭️  Models with valid cache (skipping):", color="green")
-            for model_name, analysis in analyses.items():
-                if not analysis.needs_execution:
+            if verbose and models_to_skip > 0:
+                printer.cprint(_SKIP_HEADER, color="green")
+                # All cache ages are relative to the same point in time
+                now = datetime.now(UTC)
+                for model_name, analysis in to_skip:
                     model_checked = analysis.model.last_built
 
                     # Skip models that were never built
@@ -244,11 +333,9 @@ class BuildAnalyzer:
                         printer.cprint(f"  • {model_name} (never built)")
                         continue
 
-                    now = datetime.now(timezone.utc)
-
                     # Handle timezone-naive datetimes by assuming UTC
                     if model_checked.tzinfo is None:
-                        model_checked = model_checked.replace(tzinfo=timezone.utc)
+                        model_checked = model_checked.replace(tzinfo=UTC)
 
                     age_minutes = (now - model_checked).total_seconds() / 60
                     printer.cprint(f"  • {model_name} (cached {age_minutes:.1f}m ago)")
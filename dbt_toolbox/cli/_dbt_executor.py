@@ -263,8 +263,8 @@ def execute_dbt_with_smart_selection(  # noqa: PLR0913
 
     # Perform intelligent execution analysis (enabled by default)
     if not disable_smart:
-        # Analyze which models need execution
-        analyses = build_analyzer.analyze_build_execution(model)
+        # Analyze which models need execution, the summary doesn't list the reasons
+        analyses = build_analyzer.analyze_build_execution(model, needs_reasons=False)
         build_analyzer.print_execution_analysis(analyses)
 
         if analyze_only:
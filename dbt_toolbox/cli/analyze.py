@@ -8,10 +8,15 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
-from dbt_toolbox.cli._analyze_columns import analyze_column_references
+from dbt_toolbox.cli._analyze_columns import (
+    ColumnAnalysis,
+    analysis_signature,
+    analyze_column_references,
+)
 from dbt_toolbox.cli._build_analysis import BuildAnalyzer, ExecutionReason
 from dbt_toolbox.constants import EXECUTION_TIMESTAMP
 from dbt_toolbox.data_models import Model, Seed, Source
+from dbt_toolbox.dbt_parser._cache import ByteCache
 from dbt_toolbox.dbt_parser.dbt_parser import dbt_parser
 from dbt_toolbox.settings import settings
 from dbt_toolbox.utils import printer
@@ -243,6 +248,33 @@ class CacheAnalyzer:
         return f"{days} days"
 
 
+def cached_column_analysis(
+    models: dict[str, Model],
+    sources: dict[str, Source],
+    seeds: dict[str, Seed],
+    cache_file: ByteCache,
+) -> ColumnAnalysis:
+    """Analyze column references, reusing the previous analysis if none of its inputs changed.
+
+    Args:
+        models: Dictionary of model name to Model objects
+        sources: Dictionary of source full_name to Source objects
+        seeds: Dictionary of seed name to Seed objects
+        cache_file: Cache holding the signature and result of the previous analysis
+
+    Returns:
+        The column reference analysis.
+
+    """
+    signature = analysis_signature(models, sources, seeds, dialect=settings.sql_dialect)
+    cached = cache_file.read()
+    if cached and cached[0] == signature:
+        return cached[1]
+    analysis = analyze_column_references(models, sources, seeds)
+    cache_file.write((signature, analysis))
+    return analysis
+
+
 def print_column_analysis_results(
     models: dict[str, Model],
     sources: dict[str, "Source"],
@@ -257,7 +289,9 @@ def print_column_analysis_results(
 
     """
     console = Console()
-    analysis = analyze_column_references(models, sources, seeds)
+    analysis = cached_column_analysis(
+        models, sources, seeds, cache_file=dbt_parser.cache.cache_column_analysis
+    )
 
     # Check if there are any issues to report
     if (
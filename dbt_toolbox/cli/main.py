@@ -1,27 +1,57 @@
 """Main cli module."""
 
+from importlib import import_module
+
+import click
 import typer
+from typer.core import TyperGroup
+
+# Commands are only imported once invoked, as they pull in the heavy dbt parsing modules.
+# Command name -> (module, function)
+_LAZY_COMMANDS = {
+    "docs": ("dbt_toolbox.cli.docs", "docs"),
+    "build": ("dbt_toolbox.cli.build", "build"),
+    "run": ("dbt_toolbox.cli.run", "run"),
+    "clean": ("dbt_toolbox.cli.clean", "clean"),
+    "analyze": ("dbt_toolbox.cli.analyze", "analyze_command"),
+}
+
+
+class _LazyGroup(TyperGroup):
+    """Typer group that imports the lazy commands on first use."""
 
-from dbt_toolbox.cli.analyze import analyze_command
-from dbt_toolbox.cli.build import build
-from dbt_toolbox.cli.clean import clean
-from dbt_toolbox.cli.docs import docs
-from dbt_toolbox.cli.run import run
-from dbt_toolbox.settings import settings
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """List the lazy commands followed by the eager ones."""
+        return [*_LAZY_COMMANDS, *super().list_commands(ctx)]
 
-app = typer.Typer(help="dbt-toolbox CLI - Tools for working with dbt projects")
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        """Get a command, importing it if it is a lazy command."""
+        if cmd_name not in _LAZY_COMMANDS:
+            return super().get_command(ctx, cmd_name)
+        module_name, function_name = _LAZY_COMMANDS[cmd_name]
+        command_app = typer.Typer()
+        command_app.command(name=cmd_name)(getattr(import_module(module_name), function_name))
+        return typer.main.get_command(command_app)
 
 
-app.command()(docs)
-app.command()(build)
-app.command()(run)
-app.command()(clean)
-app.command(name="analyze")(analyze_command)
+app = typer.Typer(
+    cls=_LazyGroup,
+    help="dbt-toolbox CLI - Tools for working with dbt projects",
+)
+
+
+@app.callback()
+def _callback() -> None:
+    # With only one eagerly registered command typer would otherwise build a single command
+    # instead of a group
+    pass
 
 
 @app.command(name="settings")
 def settings_cmd() -> None:
     """Show all found settings and their sources."""
+    from dbt_toolbox.settings import settings  # noqa: PLC0415
+
     settings_sources = settings.get_all_settings_with_sources()
 
     typer.secho("dbt-toolbox Settings:", fg=typer.colors.BRIGHT_CYAN, bold=True)
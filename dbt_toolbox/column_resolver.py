@@ -1,8 +1,12 @@
 """Recursively resolve each column and see which are valid."""
 
-from dataclasses import dataclass, field
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass
 from enum import Enum
+from threading import Lock
 
+import sqlglot
 import sqlglot.expressions as expr
 
 from dbt_toolbox.constants import TABLE_REF_SEP
@@ -19,16 +23,16 @@ class TableType(Enum):
     AMBIGUOUS = "ambiguous"
 
 
-@dataclass
+@dataclass(slots=True)
 class _Tbl:
     """A table reference dataclass."""
 
     name: str
     type: TableType
-    available_columns: list[str] = field(default_factory=list)
+    available_columns: frozenset[str] = frozenset()
 
 
-@dataclass(kw_only=True)
+@dataclass(slots=True, frozen=True, kw_only=True)
 class ColumnReference:
     """Metadata about each column."""
 
@@ -44,131 +48,165 @@ def _debug_print(col: expr.Column, tables: dict[str, _Tbl], context: list[str])
     cprint("column", col.name, str(context), highlight_idx=1)
     for name, t in tables.items():
         p = (
-            f"cte({name})" + " columns: " + ", ".join(t.available_columns)
+            f"cte({name})" + " columns: " + ", ".join(sorted(t.available_columns))
             if t.type == TableType.CTE
             else f"tbl({name}) columns: unknown"
         )
         cprint("  " + p)
 
 
+_SEP_LEN = len(TABLE_REF_SEP)
+
+
 def _clean_tbl_name(name: str) -> str:
+    # "___ref___model___" -> "model" and "___source___src__tbl___" -> "src__tbl"
     if name.startswith(TABLE_REF_SEP):
-        return name.strip(TABLE_REF_SEP).split(TABLE_REF_SEP)[-1]
+        return name[_SEP_LEN:].partition(TABLE_REF_SEP)[2].removesuffix(TABLE_REF_SEP)
     return name
 
 
+def _iter_columns(node: expr.Expression) -> Iterator[expr.Column]:
+    """Yield all columns within node, in the same breadth first order as find_all."""
+    queue = deque([node])
+    pop, push = queue.popleft, queue.append
+    column_type, expression_type = expr.Column, expr.Expression
+    while queue:
+        n = pop()
+        if type(n) is column_type:
+            yield n  # type: ignore
+        for value in n.args.values():
+            if type(value) is list:
+                for v in value:
+                    if isinstance(v, expression_type):
+                        push(v)
+            elif isinstance(value, expression_type):
+                push(value)
+
+
 def _build_col(
     col: expr.Column,
     tables: dict[str, _Tbl],
     context: list[str],
-    existing_cols: list[ColumnReference],
+    seen_ids: set[int],
+    parent_sql: dict[int, str],
 ) -> ColumnReference | None:
-    col_id = hash(str(col) + str(col.parent))
-    if isinstance(col.this, expr.Star) or col_id in [c.id for c in existing_cols]:
+    if type(col.this) is expr.Star:
+        return None
+    # Many columns share a parent (e.g. the select itself), only generate its sql once
+    parent = col.parent
+    if (sql := parent_sql.get(id(parent))) is None:
+        sql = parent_sql[id(parent)] = str(parent)
+    col_id = hash((str(col), sql))
+    if col_id in seen_ids:
         return None
     if settings.debug:
         _debug_print(col=col, tables=tables, context=context)
     if col.table:
         t = tables.get(col.table)
-        if not t:
-            return ColumnReference(
-                id=col_id, name=col.name, reference_type=TableType.EXTERNAL, context=context
-            )
     elif len(tables) == 1:
         t = next(iter(tables.values()))
     else:
         # No table reference found, but multiple tables available. Ambiguous column reference.
-        return ColumnReference(
-            id=col_id, name=col.name, reference_type=TableType.AMBIGUOUS, context=context
-        )
-    # Now figure out if column is resolved
-    if col.name in t.available_columns:
-        resolved = True
-    elif "*" in t.available_columns:
-        resolved = None
+        t = None
+
+    resolved = None
+    if t is None:
+        reference_type = TableType.EXTERNAL if col.table else TableType.AMBIGUOUS
+        table = None
+    elif t.type == TableType.EXTERNAL:
+        reference_type = TableType.EXTERNAL
+        table = _clean_tbl_name(t.name)
     else:
-        resolved = False
-
-    if t.type == TableType.EXTERNAL:
-        return ColumnReference(
-            id=col_id,
-            name=col.name,
-            reference_type=TableType.EXTERNAL,
-            table=_clean_tbl_name(t.name),
-            context=context,
-        )
+        reference_type = t.type
+        table = t.name
+        # Now figure out if column is resolved
+        if col.name in t.available_columns:
+            resolved = True
+        elif "*" not in t.available_columns:
+            resolved = False
+
     return ColumnReference(
         id=col_id,
         name=col.name,
-        reference_type=t.type if t.type else TableType.AMBIGUOUS,
-        table=t.name,
+        reference_type=reference_type,
+        table=table,
         resolved=resolved,
         context=context,
     )
 
 
-def _resolve_from_clause(stmnt: expr.From, ctes: dict[str, _Tbl]) -> dict[str, _Tbl]:
-    if isinstance(stmnt.this, expr.Subquery):
-        subq = stmnt.this
-        subq_select = subq.this
-        return {
-            subq.alias_or_name: _Tbl(
-                name=subq.alias_or_name,
-                type=TableType.SUBQUERY,
-                available_columns=[c.alias_or_name for c in subq_select.selects]
-                if isinstance(subq_select, expr.Select)
-                else [],
-            )
-        }
-    return {
-        stmnt.alias_or_name: ctes[stmnt.name]
-        if stmnt.name in ctes
-        else _Tbl(name=stmnt.name, type=TableType.EXTERNAL)
-    }
-
-
 def _recursive_resolve(
     select_stmt: expr.Select,
     context: list[str],
     tables: dict[str, _Tbl] | None = None,
     ctes: dict[str, _Tbl] | None = None,
+    parent_sql: dict[int, str] | None = None,
 ) -> list[ColumnReference]:
     if tables is None:
         tables = {}
     if ctes is None:
         ctes = {}
+    if parent_sql is None:
+        parent_sql = {}
 
     results: list[ColumnReference] = []
     # Find all available CTEs
     for cte in select_stmt.ctes:
-        ctes[cte.alias] = _Tbl(
-            name=cte.alias,
-            available_columns=[c.alias_or_name for c in cte.selects],
+        cte_name, cte_select = cte.alias, cte.this
+        ctes[cte_name] = _Tbl(
+            name=cte_name,
+            available_columns=frozenset(c.alias_or_name for c in cte_select.selects),
             type=TableType.CTE,
         )
         results.extend(
             _recursive_resolve(
-                cte.this, context=[*context, cte.alias_or_name], tables=tables, ctes=ctes
+                cte_select,
+                context=[*context, cte_name],
+                tables=tables,
+                ctes=ctes,
+                parent_sql=parent_sql,
             )
         )
 
-    # Find all available tables (from + joins)
-    from_clause = select_stmt.find(expr.From)
-    if from_clause is not None and from_clause.parent == select_stmt:
-        tables = _resolve_from_clause(from_clause, ctes=ctes)
-        if isinstance(from_clause.this, expr.Subquery):
+    # Find all available tables (from + joins). These are taken from the select's direct
+    # children rather than searched for, so the only subtree walk is the column walk below.
+    from_clause: expr.From | None = None
+    joins: list[expr.Join] = []
+    for child in select_stmt.iter_expressions():
+        if type(child) is expr.From:
+            from_clause = child
+        elif type(child) is expr.Join:
+            joins.append(child)
+    if from_clause is not None:
+        source = from_clause.this
+        if type(source) is expr.Subquery:
+            # Register the subquery's columns and resolve the subquery itself in one go
+            subq_name, subq_select = source.alias_or_name, source.this
+            tables = {
+                subq_name: _Tbl(
+                    name=subq_name,
+                    type=TableType.SUBQUERY,
+                    available_columns=frozenset(c.alias_or_name for c in subq_select.selects)
+                    if type(subq_select) is expr.Select
+                    else frozenset(),
+                )
+            }
             results.extend(
                 _recursive_resolve(
-                    select_stmt=from_clause.this.this, context=[*context, "from_subquery"]
+                    select_stmt=subq_select,
+                    context=[*context, "from_subquery"],
+                    parent_sql=parent_sql,
                 )
             )
+        else:
+            tables = {
+                from_clause.alias_or_name: ctes.get(source.name)
+                or _Tbl(name=source.name, type=TableType.EXTERNAL)
+            }
 
     # Find all joined tables
-    for join in select_stmt.find_all(expr.Join):
-        # Only take joins within current context
-        if join.parent != select_stmt:
-            continue
-        join_table = join.find(expr.Table)
+    for join in joins:
+        join_table = join.this if type(join.this) is expr.Table else join.find(expr.Table)
         if join_table is None:
             continue
         tables[join_table.alias_or_name] = (
@@ -177,32 +215,69 @@ def _recursive_resolve(
             else _Tbl(name=join_table.name, type=TableType.EXTERNAL)
         )
 
+    # Ids of all columns resolved so far, built once instead of per column
+    seen_ids = {c.id for c in results}
     subq_id = 0
     for obj in select_stmt.selects:
         col = obj.this if isinstance(obj, expr.Alias) else obj
         # Resolve any subqueries
-        if isinstance(col, expr.Subquery):
-            results.extend(
-                _recursive_resolve(col.this, context=[*context, f"sub#{subq_id}"], tables=tables)
+        if type(col) is expr.Subquery:
+            subq_results = _recursive_resolve(
+                col.this,
+                context=[*context, f"sub#{subq_id}"],
+                tables=tables,
+                parent_sql=parent_sql,
             )
+            results.extend(subq_results)
+            seen_ids.update(c.id for c in subq_results)
             subq_id += 1
         # Resolve normal columns
-        if isinstance(col, expr.Column):
-            built_col = _build_col(col=col, tables=tables, context=context, existing_cols=results)
+        if type(col) is expr.Column:
+            built_col = _build_col(
+                col=col,
+                tables=tables,
+                context=context,
+                seen_ids=seen_ids,
+                parent_sql=parent_sql,
+            )
             if built_col:
                 results.append(built_col)
+                seen_ids.add(built_col.id)
         else:
             # Finally investigate all other columns, unless they have already been investigated.
-            for subcol in col.find_all(expr.Column):
+            for subcol in _iter_columns(col):
                 built_sub_col = _build_col(
-                    col=subcol, tables=tables, context=context, existing_cols=results
+                    col=subcol,
+                    tables=tables,
+                    context=context,
+                    seen_ids=seen_ids,
+                    parent_sql=parent_sql,
                 )
                 if built_sub_col:
                     results.append(built_sub_col)
+                    seen_ids.add(built_sub_col.id)
 
     return results
 
 
+def parse_for_lineage(sql: str, dialect: str | None = None) -> expr.Expression:
+    """Parse sql once, into a tree to share between lineage resolution and other consumers.
+
+    Lineage resolution never modifies the tree, so it can be reused as-is. Consumers that
+    rewrite the tree (e.g. the sqlglot optimizer, which copies it first) must not mutate
+    the returned tree in place.
+
+    Args:
+        sql:        The sql to parse.
+        dialect:    The sql dialect to parse with.
+
+    Returns:
+        The parsed SQLGlot expression.
+
+    """
+    return sqlglot.parse_one(sql, dialect=dialect)
+
+
 def resolve_column_lineage(glot_code: expr.Expression) -> list[ColumnReference]:
     """Recursively resolve column references in a SQL expression.
 
@@ -230,3 +305,34 @@ def resolve_column_lineage(glot_code: expr.Expression) -> list[ColumnReference]:
         return []
     # Clean up table names before returning
     return _recursive_resolve(glot_code, context=["root"])
+
+
+# Lineage results keyed on the expression they were resolved from. Expressions compare and
+# hash by structure, so equal sql parsed again (or from another dialect) hits the same entry.
+_LINEAGE_CACHE_SIZE = 4096
+_lineage_cache: dict[expr.Expression, tuple[ColumnReference, ...]] = {}
+_lineage_cache_lock = Lock()
+
+
+def resolve_column_lineage_cached(glot_code: expr.Expression) -> list[ColumnReference]:
+    """Resolve column references, reusing the result for previously seen expressions.
+
+    The expression is kept as cache key, so it must not be mutated afterwards.
+
+    Args:
+        glot_code:  The SQLGlot expression to analyze, e.g. from parse_for_lineage.
+
+    Returns:
+        A new list of the (shared) ColumnReference objects, see resolve_column_lineage.
+
+    """
+    with _lineage_cache_lock:
+        cached = _lineage_cache.get(glot_code)
+    if cached is None:
+        cached = tuple(resolve_column_lineage(glot_code))
+        with _lineage_cache_lock:
+            if len(_lineage_cache) >= _LINEAGE_CACHE_SIZE:
+                # Evict the oldest entry
+                del _lineage_cache[next(iter(_lineage_cache))]
+            _lineage_cache[glot_code] = cached
+    return list(cached)
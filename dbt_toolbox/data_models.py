@@ -1,9 +1,10 @@
 """Module collecting all data models."""
 
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from functools import cached_property
-from hashlib import md5
+from hashlib import blake2b
 from pathlib import Path
 
 import yamlium
@@ -13,6 +14,13 @@ from dbt_toolbox.column_resolver import ColumnReference
 from dbt_toolbox.constants import EXECUTION_TIMESTAMP
 from dbt_toolbox.settings import settings
 
+_TEST_BLOCK = re.compile(r"\{%-?\s*test\b")
+
+
+def _fingerprint(data: bytes, /) -> str:
+    """Short, non cryptographic fingerprint of some content, used for cache invalidation."""
+    return blake2b(data, digest_size=8).hexdigest()[:5]
+
 
 @dataclass
 class MacroBase:
@@ -24,15 +32,15 @@ class MacroBase:
     macro_path: Path
     source: str | None = None
 
-    @property
+    @cached_property
     def is_test(self) -> bool:
         """Whether the macro is a test macro."""
-        return "{% test" in self.raw_code or "{%- test" in self.raw_code
+        return _TEST_BLOCK.search(self.raw_code) is not None
 
-    @property
+    @cached_property
     def id(self) -> str:
         """Get id as name+hash of macro."""
-        return self.name + md5(self.raw_code.encode()).hexdigest()[:5]  # noqa: S324
+        return self.name + _fingerprint(self.raw_code.encode())
 
     @property
     def code(self) -> str:
@@ -49,7 +57,7 @@ class Macro(MacroBase):
     last_built: datetime = EXECUTION_TIMESTAMP
 
 
-@dataclass
+@dataclass(slots=True)
 class DependsOn:
     """List of a model's dependencies."""
 
@@ -66,13 +74,13 @@ class ModelBase:
     path: Path
     raw_code: str
 
-    @property
+    @cached_property
     def hash(self) -> str:
         """Get a model's hash based on name and code."""
-        return self.name + md5(self.raw_code.encode()).hexdigest()[:5]  # noqa: S324
+        return self.name + _fingerprint(self.raw_code.encode())
 
 
-@dataclass
+@dataclass(slots=True)
 class ColDocs:
     """Column documentation."""
 
@@ -80,7 +88,7 @@ class ColDocs:
     description: str | None
 
 
-@dataclass
+@dataclass(slots=True)
 class ColumnChanges:
     """Column changes detected between existing and new columns."""
 
@@ -99,12 +107,12 @@ class Source:
     path: Path
     columns: list[ColDocs]
 
-    @property
+    @cached_property
     def full_name(self) -> str:
         """Get the full source name as source_name__table_name."""
         return f"{self.source_name}__{self.name}"
 
-    @property
+    @cached_property
     def compiled_columns(self) -> list[str]:
         """Get list of column names."""
         return [col.name for col in self.columns]
@@ -117,14 +125,21 @@ class Seed:
     name: str
     path: Path
 
-    @property
+    @cached_property
     def id(self) -> str:
-        """Get id as name+hash of file modification time."""
+        """Get id as name+hash of file modification time.
+
+        The file is only stat'ed once, call `invalidate` to pick up later changes.
+        """
         stat = self.path.stat()
-        return self.name + md5(str(stat.st_mtime).encode()).hexdigest()[:5]  # noqa: S324
+        return self.name + _fingerprint(str(stat.st_mtime).encode())
 
+    def invalidate(self) -> None:
+        """Forget the id, so that it is recomputed from the file on next access."""
+        self.__dict__.pop("id", None)
 
-@dataclass
+
+@dataclass(slots=True)
 class YamlDocs:
     """Documentation from a model yaml."""
 
@@ -206,15 +221,29 @@ class Model(ModelBase):
         """All documented columns."""
         return [c.name for c in self.column_descriptions]
 
+    @property
+    def column_description_diff(self) -> tuple[list[str], list[str]]:
+        """Columns missing a description and descriptions of columns not in the model.
+
+        Computed together, so the columns and their documentation are only walked once.
+        """
+        final = self.final_columns
+        documented = self.documented_columns
+        final_set, documented_set = set(final), set(documented)
+        return (
+            [c for c in final if c not in documented_set],
+            [c for c in documented if c not in final_set],
+        )
+
     @property
     def columns_missing_description(self) -> list[str]:
         """Columns that are missing a description."""
-        return [c for c in self.final_columns if c not in self.documented_columns]
+        return self.column_description_diff[0]
 
     @property
     def superfluent_column_descriptions(self) -> list[str]:
         """Columns that are described but not in model."""
-        return [c for c in self.documented_columns if c not in self.final_columns]
+        return self.column_description_diff[1]
 
     @cached_property
     def load_yaml(self) -> yamlium.Mapping | None:
@@ -259,14 +288,7 @@ class Model(ModelBase):
         full_yaml = self.load_yaml
         if full_yaml is None or self.yaml_docs is None:
             raise ValueError("No yaml docs found.")
-        yml_models = full_yaml["models"]  # type: ignore
-        yml_models = [
-            *yml_models[0 : self._yaml_docs_index],  # type: ignore
-            yml,
-            *yml_models[self._yaml_docs_index + 1 :],  # type: ignore
-        ]
-
-        full_yaml["models"] = yml_models
+        full_yaml["models"][self._yaml_docs_index] = yml  # type: ignore
         self.yaml_docs.path.write_text(
             "\n".join([x for x in full_yaml.to_yaml().split("\n") if x]) + "\n",
         )
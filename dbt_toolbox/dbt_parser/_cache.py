@@ -64,7 +64,7 @@ class _SetCache(_CacheHolder):
         self.path.write_bytes(pickle.dumps(data))
 
 
-class _ByteCache(_CacheHolder):
+class ByteCache(_CacheHolder):
     """Cache handler for arbitrary data using pickle serialization."""
 
     def read(self) -> Any:  # noqa: ANN401
@@ -88,6 +88,10 @@ class _ByteCache(_CacheHolder):
         self.path.write_bytes(pickle.dumps(data))
 
 
+# Bump whenever the layout of cached objects changes, caches of other versions are dropped.
+_CACHE_VERSION = "5"
+
+
 class Cache:
     """Caching help tool."""
 
@@ -95,8 +99,10 @@ class Cache:
         """Clear the cache."""
         shutil.rmtree(self.cache_path)
         self.cache_path.mkdir()
-        # Ensure models subdirectory is created
+        (self.cache_path / "cache_version").write_text(_CACHE_VERSION)
+        # Ensure the subdirectories are created
         self.cache_models_path.mkdir(exist_ok=True)
+        self.cache_jinja_bytecode_path.mkdir(exist_ok=True)
         if settings.debug:
             logger.debug(f"Cleared cache at {self.cache_path}")
 
@@ -132,10 +138,20 @@ class Cache:
 
     @cached_property
     def cache_path(self) -> Path:
-        """Instantiate the cacher, build folder if not exists."""
+        """Instantiate the cacher, build folder if not exists.
+
+        A cache written with another cache version is removed, since its pickled objects
+        may not load correctly.
+        """
         p = settings.dbt_project_dir / ".dbt_toolbox"
+        version_file = p / "cache_version"
+        if p.exists() and (
+            not version_file.exists() or version_file.read_text() != _CACHE_VERSION
+        ):
+            shutil.rmtree(p)
         if not p.exists():
             p.mkdir()
+            version_file.write_text(_CACHE_VERSION)
         return p
 
     # ------------ Private internal properties ------------
@@ -144,17 +160,25 @@ class Cache:
         return _SetCache(self.cache_path / "macro_watcher.cache")
 
     @cached_property
-    def _cache_dbt_project(self) -> _ByteCache:
-        return _ByteCache(self.cache_path / "dbt_project.cache")
+    def _cache_dbt_project(self) -> ByteCache:
+        return ByteCache(self.cache_path / "dbt_project.cache")
 
     @cached_property
-    def _cache_dbt_profile(self) -> _ByteCache:
-        return _ByteCache(self.cache_path / "dbt_profile.cache")
+    def _cache_dbt_profile(self) -> ByteCache:
+        return ByteCache(self.cache_path / "dbt_profile.cache")
 
     @cached_property
-    def cache_jinja_env(self) -> _ByteCache:
+    def cache_jinja_env(self) -> ByteCache:
         """Cache handler for jinja environment."""
-        return _ByteCache(self.cache_path / "jinja_env.cache")
+        return ByteCache(self.cache_path / "jinja_env.cache")
+
+    @cached_property
+    def cache_jinja_bytecode_path(self) -> Path:
+        """Path to the compiled jinja templates cache directory."""
+        bytecode_path = self.cache_path / "jinja_bytecode"
+        if not bytecode_path.exists():
+            bytecode_path.mkdir()
+        return bytecode_path
 
     @cached_property
     def cache_models_path(self) -> Path:
@@ -164,7 +188,7 @@ class Cache:
             models_path.mkdir()
         return models_path
 
-    def get_model_cache(self, model_name: str) -> _ByteCache:
+    def get_model_cache(self, model_name: str) -> ByteCache:
         """Get cache handler for a specific model.
 
         Args:
@@ -174,7 +198,7 @@ class Cache:
             Cache handler for the specific model.
 
         """
-        return _ByteCache(self.cache_models_path / f"{model_name}.cache")
+        return ByteCache(self.cache_models_path / f"{model_name}.cache")
 
     def get_cached_model(self, model_name: str) -> Model | None:
         """Get a specific cached model.
@@ -215,7 +239,7 @@ class Cache:
         for cache_file in self.cache_models_path.glob("*.cache"):
             model_name = cache_file.stem
             try:
-                cache_handler = _ByteCache(cache_file)
+                cache_handler = ByteCache(cache_file)
                 model = cache_handler.read()
                 if isinstance(model, Model):
                     result[model_name] = model
@@ -226,9 +250,19 @@ class Cache:
         return result
 
     @cached_property
-    def cache_macros(self) -> _ByteCache:
+    def cache_column_analysis(self) -> ByteCache:
+        """Cache handler for the latest column reference analysis."""
+        return ByteCache(self.cache_path / "column_analysis.cache")
+
+    @cached_property
+    def cache_last_manifest(self) -> ByteCache:
+        """Cache handler for the manifest hash of the latest fully fresh project analysis."""
+        return ByteCache(self.cache_path / "last_manifest.cache")
+
+    @cached_property
+    def cache_macros(self) -> ByteCache:
         """Cache handler for dbt macros."""
-        return _ByteCache(self.cache_path / "macros.cache")
+        return ByteCache(self.cache_path / "macros.cache")
 
     def _validate_macro_cache(self) -> bool:
         """Check if any macro has changed since last execution."""
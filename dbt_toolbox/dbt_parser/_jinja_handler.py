@@ -1,10 +1,12 @@
 """Module for the jinja environment builder."""
 
-import pickle
+from collections import OrderedDict
+from collections.abc import Callable
 from functools import cached_property
+from threading import Lock
 from typing import Any, Literal
 
-from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader
 from jinja2.nodes import Template
 
 from dbt_toolbox.constants import CUSTOM_MACROS, TABLE_REF_SEP
@@ -13,6 +15,11 @@ from dbt_toolbox.utils import utils
 from ._cache import cache
 
 
+def _dispatched(*args, **kwargs) -> str:  # noqa: ANN002, ANN003, ARG001
+    """Mock implementation of a macro returned by adapter.dispatch()."""
+    return "__dispatch__"
+
+
 class DummyAdapter:
     """Used in place of the dbt adapter.x functionality."""
 
@@ -20,9 +27,9 @@ class DummyAdapter:
         """Mock implementation of dbt adapter get_relation method."""
         return "__get_relation__"
 
-    def dispatch(self, *args, **kwargs) -> str:  # noqa: ANN002, ANN003, ARG002
+    def dispatch(self, *args, **kwargs) -> Callable[..., str]:  # noqa: ANN002, ANN003, ARG002
         """Mock implementation of dbt adapter dispatch method."""
-        return lambda *args, **kwargs: "__dispatch__"  # type: ignore  # noqa
+        return _dispatched
 
     def quote(self, *args, **kwargs) -> str:  # noqa: ANN002, ANN003, ARG002
         """Mock implementation of dbt adapter quote method."""
@@ -91,17 +98,15 @@ def _load_sorted_macro_dict() -> dict[str, str]:
     """
     if cache.cache_jinja_env.exists() and cache.validate_jinja_environment():
         utils.log("Found valid macro cache!")
-        return pickle.loads(cache.cache_jinja_env.read())  # noqa: S301
-    weights = {"dbt_utils": -1, CUSTOM_MACROS: 1}
-    macro_dict = dict(sorted(cache.macros_dict.items(), key=lambda x: weights.get(x[0], 0)))
-    result = {}
-    for source, macros in macro_dict.items():
-        macro_string = ""
-        for macro in macros:
-            if not macro.is_test:
-                macro_string += macro.code
-        result[source] = macro_string
-    cache.cache_jinja_env.write(pickle.dumps(result))
+        return cache.cache_jinja_env.read()
+    macros_dict = cache.macros_dict
+    # dbt_utils first, custom macros last
+    packages = [s for s in macros_dict if s not in ("dbt_utils", CUSTOM_MACROS)]
+    sources = [s for s in ("dbt_utils", *packages, CUSTOM_MACROS) if s in macros_dict]
+    result = {
+        source: "".join(m.code for m in macros_dict[source] if not m.is_test) for source in sources
+    }
+    cache.cache_jinja_env.write(result)
     return result
 
 
@@ -115,7 +120,7 @@ def _get_base_env() -> Environment:
         Configured Jinja Environment with dbt compatibility.
 
     """
-    bytecode_cache = FileSystemBytecodeCache(str(utils.path("jinja_env")))
+    bytecode_cache = FileSystemBytecodeCache(str(cache.cache_jinja_bytecode_path))
     env = Environment(
         extensions=["jinja2.ext.do"],
         loader=FileSystemLoader("templates"),
@@ -142,6 +147,30 @@ def _get_base_env() -> Environment:
     return env
 
 
+def _macro_module(env: Environment, source: str, macro_string: str) -> dict[str, Any]:
+    """Load the macros of a source as a module.
+
+    Same as env.from_string(macro_string).module, but the compiled code is stored in the
+    environment's bytecode cache, so unchanged macros are not parsed and compiled again.
+
+    Args:
+        env: The jinja environment.
+        source: Name of the macro source.
+        macro_string: All macros of the source concatenated.
+
+    Returns:
+        The module namespace containing the macros.
+
+    """
+    bytecode_cache: BytecodeCache = env.bytecode_cache  # type: ignore
+    bucket = bytecode_cache.get_bucket(env, source, None, macro_string)
+    if bucket.code is None:
+        bucket.code = env.compile(macro_string)
+        bytecode_cache.set_bucket(bucket)
+    template = env.template_class.from_code(env, bucket.code, env.make_globals(None))
+    return template.module.__dict__
+
+
 def _build_jinja_env() -> Environment:
     """Build complete Jinja environment with macros.
 
@@ -154,7 +183,7 @@ def _build_jinja_env() -> Environment:
     """
     env = _get_base_env()
     for source, macro_string in _load_sorted_macro_dict().items():
-        modules = env.from_string(macro_string).module.__dict__
+        modules = _macro_module(env, source, macro_string)
         if source == CUSTOM_MACROS:  # If they are custom macros, add them to global
             env.globals.update(modules)
         else:  # Otherwise add them under the source's namespace.
@@ -162,21 +191,43 @@ def _build_jinja_env() -> Environment:
     return env
 
 
+_RENDER_CACHE_SIZE = 1024
+
+
 class Jinja:
     """Jinja class holder."""
 
+    def __init__(self) -> None:
+        """Initialize the per-process render and parse caches."""
+        self._render_cache: OrderedDict[str, str] = OrderedDict()
+        self._parse_cache: OrderedDict[str, Template] = OrderedDict()
+        self._cache_lock = Lock()
+
     @cached_property
     def env(self) -> Environment:
         """The jinja environment."""
         return _build_jinja_env()
 
+    def _cached(self, cache: OrderedDict, sql: str, build: Callable[[str], Any]) -> Any:  # noqa: ANN401
+        """Get a value from a least recently used cache, building it on a miss."""
+        with self._cache_lock:
+            if sql in cache:
+                cache.move_to_end(sql)
+                return cache[sql]
+        value = build(sql)
+        with self._cache_lock:
+            cache[sql] = value
+            if len(cache) > _RENDER_CACHE_SIZE:
+                cache.popitem(last=False)
+        return value
+
     def render(self, sql: str) -> str:
         """Render a model using macros."""
-        return self.env.from_string(sql).render()
+        return self._cached(self._render_cache, sql, lambda s: self.env.from_string(s).render())
 
     def parse(self, sql: str) -> Template:
         """Parse a model into jinja tree."""
-        return self.env.parse(sql)
+        return self._cached(self._parse_cache, sql, self.env.parse)
 
 
 jinja = Jinja()
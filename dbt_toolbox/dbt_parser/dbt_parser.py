@@ -2,13 +2,14 @@
 
 import re
 from functools import cached_property
+from hashlib import blake2b
 
-import yamlium
 from jinja2.nodes import Call, Output
-from sqlglot import ParseError, parse_one
+from sqlglot import ParseError
 from sqlglot.optimizer import optimize
 
-from dbt_toolbox.column_resolver import resolve_column_lineage
+from dbt_toolbox._yaml import read_yaml
+from dbt_toolbox.column_resolver import parse_for_lineage, resolve_column_lineage_cached
 from dbt_toolbox.data_models import (
     ColDocs,
     DependsOn,
@@ -84,7 +85,7 @@ def _build_model(m: ModelBase, /) -> Model:
                 else:
                     deps.macros.append(node_name)
     rendered_code = jinja.render(m.raw_code)
-    glot_code = parse_one(rendered_code, dialect=settings.sql_dialect)  # type: ignore
+    glot_code = parse_for_lineage(rendered_code, dialect=settings.sql_dialect)
     try:
         optimized_glot_code = optimize(glot_code, dialect=settings.sql_dialect)
     except:  # noqa: E722
@@ -98,13 +99,17 @@ def _build_model(m: ModelBase, /) -> Model:
         upstream=deps,
         glot_code=glot_code,  # type: ignore
         optimized_glot_code=optimized_glot_code,  # type: ignore
-        column_references=resolve_column_lineage(glot_code),
+        column_references=resolve_column_lineage_cached(glot_code),
     )
 
 
 class dbtParser:  # noqa: N801
     """dbt parser class."""
 
+    # Bumped every time the dependency graph is (re)built.
+    # Used as an invalidation token by anything memoizing graph traversals.
+    graph_version: int = 0
+
     @property
     def cache(self) -> Cache:
         """Reference to the cache."""
@@ -115,7 +120,7 @@ class dbtParser:  # noqa: N801
         """Get the yaml documentation for all models."""
         result = {}
         for path in utils.model_yaml_paths:
-            models: list[dict] = yamlium.parse(path).to_dict().get("models", [])  # type: ignore
+            models: list[dict] = read_yaml(path).get("models", [])
             for m in models:
                 result[m["name"]] = YamlDocs(
                     path=path,
@@ -132,7 +137,7 @@ class dbtParser:  # noqa: N801
         """Get all sources defined in the project."""
         result = {}
         for path in utils.model_yaml_paths:
-            sources: list[dict] = yamlium.parse(path).to_dict().get("sources", [])  # type: ignore
+            sources: list[dict] = read_yaml(path).get("sources", [])
             for source in sources:
                 source_name = source["name"]
                 for table in source.get("tables", []):
@@ -231,6 +236,32 @@ class dbtParser:  # noqa: N801
 
         return final_models
 
+    @cached_property
+    def model_names(self) -> frozenset[str]:
+        """Names of all available models, for fast membership checks and set operations."""
+        return frozenset(self.models)
+
+    @cached_property
+    def manifest_hash(self) -> str:
+        """Hash of everything deciding whether models need execution.
+
+        Covers the code and build state of every model, the modification time of every
+        macro file and the cache validity setting.
+        """
+        digest = blake2b(digest_size=16)
+        digest.update(str(settings.cache_validity_minutes).encode())
+        models = self.models
+        for name in sorted(models):
+            model = models[name]
+            digest.update(f"{model.hash}|{model.last_built}|{model.last_build_failed}".encode())
+        for macro_path in sorted({m.macro_path for m in self.macros.values()}):
+            try:
+                mtime = macro_path.stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            digest.update(f"{macro_path}|{mtime}".encode())
+        return digest.hexdigest()
+
     @cached_property
     def macros(self) -> dict[str, Macro]:
         """Fetch all available macros, prioritizing cache if valid."""
@@ -274,6 +305,7 @@ class dbtParser:  # noqa: N801
 
         """
         graph = DependencyGraph()
+        self.graph_version += 1
 
         # Add all models as nodes
         for model_name, model in self.models.items():
@@ -297,6 +329,16 @@ class dbtParser:  # noqa: N801
 
         return graph
 
+    def current_graph_version(self) -> int:
+        """Get the version of the dependency graph, building the graph first if needed.
+
+        Returns:
+            Token that changes every time the dependency graph is rebuilt.
+
+        """
+        _ = self.dependency_graph  # Building the graph bumps graph_version
+        return self.graph_version
+
     def get_downstream_models(self, name: str) -> list[Model]:
         """Get all downstream models that depend on the given model or macro.
 
@@ -8,7 +8,32 @@ from typing import Any, NamedTuple
 
 import tomli
 import typer
-import yamlium
+
+from dbt_toolbox._yaml import read_yaml
+
+# Files found by _find_upwards. Misses are not cached, since the file may be created later.
+_found_files: dict[tuple[Path, str], Path] = {}
+
+
+def _find_upwards(start_path: Path, filename: str, /) -> Path | None:
+    """Find the closest directory at or above start_path containing filename.
+
+    Args:
+        start_path: Path to start searching from.
+        filename: Name of the file to search for.
+
+    Returns:
+        Path to the file, or None if not found.
+
+    """
+    if (found := _found_files.get((start_path, filename))) is not None:
+        return found
+    for parent in (start_path, *start_path.parents):
+        path = parent / filename
+        if path.is_file():
+            _found_files[start_path, filename] = path
+            return path
+    return None
 
 
 class Setting(NamedTuple):
@@ -32,12 +57,8 @@ def _find_dbt_project_root(start_path: Path | None = None) -> Path | None:
         Path to dbt project root, or None if not found.
 
     """
-    current = start_path or Path.cwd()
-    for parent in [current, *list(current.parents)]:
-        dbt_project_file = parent / "dbt_project.yml"
-        if dbt_project_file.exists():
-            return parent
-    return None
+    dbt_project_file = _find_upwards(start_path or Path.cwd(), "dbt_project.yml")
+    return dbt_project_file.parent if dbt_project_file else None
 
 
 def _find_toml_settings(filename: str = "pyproject.toml") -> tuple[dict, Path | None]:
@@ -53,15 +74,8 @@ def _find_toml_settings(filename: str = "pyproject.toml") -> tuple[dict, Path |
         Tuple of (dictionary of dbt_toolbox settings, path to toml file).
 
     """
-    current = Path.cwd()
-    toml = None
-    toml_path = None
-    for parent in [current, *list(current.parents)]:
-        p = parent / filename
-        if p.exists():
-            toml = tomli.loads(p.read_text())
-            toml_path = p
-            break
+    toml_path = _find_upwards(Path.cwd(), filename)
+    toml = tomli.loads(toml_path.read_text()) if toml_path else None
     if toml:
         return toml.get("tool", {}).get("dbt_toolbox", {}), toml_path
     return {}, None
@@ -136,7 +150,7 @@ def _get_bool_setting(name: str, default: str, /) -> Setting:
     return Setting(value=bool_value, source=source.source, location=source.location)
 
 
-class _DbtProfile:
+class DbtProfile:
     """Represents a dbt profile configuration with dynamic properties."""
 
     type: str
@@ -144,20 +158,18 @@ class _DbtProfile:
     def __init__(self, profiles_path: Path) -> None:
         """Build a dynamic property factory for dbt target.
 
-        Loads the profiles.yml file, finds the default target, and
+        Loads the profiles.yml file, finds the default target of the first profile, and
         dynamically sets all target properties as instance attributes.
         """
         default_target = None
         # Find the default target
-        for k, v, _ in yamlium.parse(profiles_path).walk_keys():
-            if k == "target":
-                default_target = str(v)
-            if default_target and k == default_target:
+        for profile in read_yaml(profiles_path).values():
+            if isinstance(profile, dict) and "target" in profile and "outputs" in profile:
+                default_target = str(profile["target"])
+                # Set dynamic typing on the profile
+                for key, value in profile["outputs"][default_target].items():
+                    setattr(self, key, value)
                 break
-
-        # Set dynamic typing on the profile
-        for key, value in v.to_dict().items():  # type: ignore
-            setattr(self, key, value)
         self.name = default_target
 
 
@@ -268,14 +280,15 @@ class Settings:
         return self._dbt_profiles_yaml_path.value
 
     @cached_property
-    def _dbt_profile(self) -> _DbtProfile:
-        return _DbtProfile(profiles_path=self.dbt_profiles_yaml_path)
+    def dbt_profile(self) -> DbtProfile:
+        """The default target of the dbt profile."""
+        return DbtProfile(profiles_path=self.dbt_profiles_yaml_path)
 
     @cached_property
     def _sql_dialect(self) -> Setting:
-        if hasattr(self._dbt_profile, "type"):
+        if hasattr(self.dbt_profile, "type"):
             return Setting(
-                value=self._dbt_profile.type,
+                value=self.dbt_profile.type,
                 source="dbt",
                 location=str(self.dbt_profiles_yaml_path),
             )
@@ -29,10 +29,11 @@ def check_column_documentation() -> dict[str, ColumnDocumentationResult]:
 
     for model_name, model in dbt_parser.models.items():
         # Only include models that have documentation issues
-        if model.columns_missing_description or model.superfluent_column_descriptions:
+        missing, superfluous = model.column_description_diff
+        if missing or superfluous:
             results[model_name] = ColumnDocumentationResult(
-                missing_descriptions=model.columns_missing_description,
-                superfluous_descriptions=model.superfluent_column_descriptions,
+                missing_descriptions=missing,
+                superfluous_descriptions=superfluous,
             )
 
     return results
@@ -1,9 +1,14 @@
 """Simple color terminal printing support."""
 
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Literal
 
 import typer
 
+# Stack of active output buffers, see cbuffered
+_buffers: list[list[str]] = []
+
 
 def _red(text: str, /) -> str:
     """Print text in red color."""
@@ -54,4 +59,23 @@ def cprint(
                 if color == "bright_black"
                 else t,
             )
-    typer.echo(" ".join(colored_texts), color=True)
+    line = " ".join(colored_texts)
+    if _buffers:
+        _buffers[-1].append(line)
+    else:
+        typer.echo(line, color=True)
+
+
+@contextmanager
+def cbuffered() -> Iterator[None]:
+    """Collect all cprint output within the block and write it out at once on exit."""
+    lines: list[str] = []
+    _buffers.append(lines)
+    try:
+        yield
+    finally:
+        _buffers.pop()
+        if _buffers:
+            _buffers[-1].extend(lines)
+        elif lines:
+            typer.echo("\n".join(lines), color=True)
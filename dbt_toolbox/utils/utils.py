@@ -8,7 +8,8 @@ from jinja2 import Environment
 from loguru import logger
 from yamlium import Mapping, parse
 
-from dbt_toolbox.settings import settings
+from dbt_toolbox._yaml import parse_yaml
+from dbt_toolbox.settings import DbtProfile, settings
 
 
 class _DbtProject:
@@ -17,7 +18,7 @@ class _DbtProject:
     def __init__(self) -> None:
         """Initialize by loading and parsing dbt_project.yml."""
         self.text = settings.dbt_project_yaml_path.read_text()
-        self.parsed: dict = parse(self.text).to_dict()  # type: ignore
+        self.parsed: dict = parse_yaml(self.text)
 
     def rendered_parse(self, env: Environment) -> Mapping:
         """Parse the project file with Jinja rendering.
@@ -48,31 +49,6 @@ class _DbtProject:
         return self.parsed.get("seed-paths", ["seeds"])
 
 
-class _DbtProfile:
-    """Represents a dbt profile configuration with dynamic properties."""
-
-    type: str
-
-    def __init__(self) -> None:
-        """Build a dynamic property factory for dbt target.
-
-        Loads the profiles.yml file, finds the default target, and
-        dynamically sets all target properties as instance attributes.
-        """
-        default_target = None
-        # Find the default target
-        for k, v, _ in parse(settings.dbt_profiles_yaml_path).walk_keys():
-            if k == "target":
-                default_target = str(v)
-            if default_target and k == default_target:
-                break
-
-        # Set dynamic typing on the profile
-        for key, value in v.to_dict().items():  # type: ignore
-            setattr(self, key, value)
-        self.name = default_target
-
-
 class Utils:
     """Utility class."""
 
@@ -82,9 +58,9 @@ class Utils:
         return _DbtProject()
 
     @cached_property
-    def dbt_profile(self) -> _DbtProfile:
+    def dbt_profile(self) -> DbtProfile:
         """Get dbt profile."""
-        return _DbtProfile()
+        return settings.dbt_profile
 
     def list_files(self, path: Path | str, file_suffix: str | list[str]) -> list[Path]:
         """Do a glob search of files using file type.
@@ -0,0 +1,116 @@
+"""Tests for the column reference analysis."""
+
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+import sqlglot
+
+from dbt_toolbox.cli._analyze_columns import analyze_column_references
+from dbt_toolbox.cli.analyze import cached_column_analysis
+from dbt_toolbox.column_resolver import ColumnReference, TableType
+from dbt_toolbox.data_models import ColDocs, DependsOn, Model, Seed, Source
+from dbt_toolbox.dbt_parser._cache import ByteCache
+from dbt_toolbox.settings import settings
+
+
+def _model(name: str, sql: str, column_references: list[ColumnReference]) -> Model:
+    """Build a minimal model from sql."""
+    return Model(
+        name=name,
+        path=Path(f"{name}.sql"),
+        raw_code=sql,
+        rendered_code=sql,
+        glot_code=sqlglot.parse_one(sql, dialect="duckdb"),  # type: ignore
+        upstream=DependsOn(),
+        column_references=column_references,
+    )
+
+
+def _ref(
+    name: str,
+    table: str,
+    reference_type: TableType = TableType.EXTERNAL,
+    resolved: bool | None = None,
+) -> ColumnReference:
+    return ColumnReference(
+        id=hash((name, table)),
+        name=name,
+        table=table,
+        reference_type=reference_type,
+        resolved=resolved,
+    )
+
+
+def test_analyze_column_references() -> None:
+    """Test detection of missing columns, missing references and CTE issues."""
+    upstream = _model("upstream", "select a, b from somewhere", [])
+    downstream = _model(
+        "downstream",
+        "select a, c, d from upstream",
+        [
+            _ref("a", "upstream"),
+            _ref("c", "upstream"),
+            _ref("c", "upstream"),  # Duplicates are reported once
+            _ref("id", "src__tbl"),
+            _ref("missing", "src__tbl"),
+            _ref("anything", "a_seed"),
+            _ref("x", "not_a_model"),
+            _ref("x", "not_a_model"),
+            _ref("e", "my_cte", TableType.CTE, resolved=False),
+            _ref("f", "my_cte", TableType.CTE, resolved=True),
+            # A CTE shadowing an existing model is validated against the model
+            _ref("b", "upstream", TableType.CTE, resolved=False),
+            _ref("z", "upstream", TableType.CTE, resolved=False),
+            _ref("no_table", None),  # type: ignore
+        ],
+    )
+    source = Source(
+        name="tbl",
+        source_name="src",
+        description=None,
+        path=Path("sources.yml"),
+        columns=[ColDocs(name="id", description=None)],
+    )
+    seed = Seed(name="a_seed", path=Path("a_seed.csv"))
+
+    analysis = analyze_column_references(
+        models={"upstream": upstream, "downstream": downstream},
+        sources={"src__tbl": source},
+        seeds={"a_seed": seed},
+    )
+
+    assert analysis.non_existent_columns == {
+        "downstream": {"upstream": ["c", "z"], "src__tbl": ["missing"]},
+    }
+    assert analysis.referenced_non_existent_models == {"downstream": ["not_a_model"]}
+    assert analysis.cte_column_issues == {"downstream": {"my_cte": ["e"]}}
+
+
+def test_column_analysis_is_cached(tmp_path: Path) -> None:
+    """Test that the analysis is reused until any model or the dialect changes."""
+    cache_file = ByteCache(tmp_path / "column_analysis.cache")
+    upstream = _model("cached_upstream", "select a from somewhere", [])
+    downstream = _model("cached_downstream", "select b from x", [_ref("b", "cached_upstream")])
+    models = {"cached_upstream": upstream, "cached_downstream": downstream}
+
+    analysis = cached_column_analysis(models, {}, {}, cache_file=cache_file)
+    assert analysis.non_existent_columns == {"cached_downstream": {"cached_upstream": ["b"]}}
+
+    # Tamper with the cached result, an unchanged project should return it as-is
+    signature, cached = cache_file.read()
+    tampered = replace(cached, non_existent_columns={})
+    cache_file.write((signature, tampered))
+    assert cached_column_analysis(models, {}, {}, cache_file=cache_file) == tampered
+
+    # Changing the dialect invalidates the cache
+    with patch.object(settings, "sql_dialect", "snowflake"):
+        assert cached_column_analysis(models, {}, {}, cache_file=cache_file) == analysis
+    assert cache_file.read()[0] != signature
+
+    # Changing a model's code invalidates the cache
+    cache_file.write((signature, tampered))
+    models["cached_upstream"] = _model("cached_upstream", "select a, b from somewhere", [])
+    analysis = cached_column_analysis(models, {}, {}, cache_file=cache_file)
+    assert analysis.non_existent_columns == {}
+    assert cache_file.read()[0] != signature
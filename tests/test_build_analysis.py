@@ -0,0 +1,112 @@
+"""Tests for the build execution analysis."""
+
+from datetime import timedelta
+from unittest.mock import call, patch
+
+from dbt_toolbox.cli._build_analysis import BuildAnalyzer
+from dbt_toolbox.constants import EXECUTION_TIMESTAMP
+from dbt_toolbox.dbt_parser import dbt_parser
+
+
+class TestParseDbtSelection:
+    """Test dbt selection syntax parsing."""
+
+    def test_no_selection_returns_all_models(self) -> None:
+        """Test that an empty selection targets all models."""
+        assert BuildAnalyzer().parse_dbt_selection(None) == set(dbt_parser.models)
+
+    def test_selection_patterns(self) -> None:
+        """Test direct, upstream, downstream and combined selections."""
+        analyzer = BuildAnalyzer()
+        assert analyzer.parse_dbt_selection("customers") == {"customers"}
+        assert analyzer.parse_dbt_selection("customers+") == {"customers", "customer_orders"}
+        assert analyzer.parse_dbt_selection("+customer_orders") == {
+            "customer_orders",
+            "customers",
+            "orders",
+        }
+        assert analyzer.parse_dbt_selection("+orders+") == {"orders", "customer_orders"}
+        assert analyzer.parse_dbt_selection("customers, orders") == {"customers", "orders"}
+        assert analyzer.parse_dbt_selection("does_not_exist+") == set()
+
+    def test_selection_is_memoized_per_graph_version(self) -> None:
+        """Test that traversals are reused until the graph version changes."""
+        analyzer = BuildAnalyzer()
+        first = analyzer.parse_dbt_selection("+customer_orders")
+        first.add("mutated")
+        assert "mutated" not in analyzer.parse_dbt_selection("+customer_orders")
+        assert (dbt_parser.current_graph_version(), "customer_orders") in analyzer._upstream_cache
+
+
+class TestAnalyzeBuildExecution:
+    """Test the execution analysis of a selection."""
+
+    def test_macro_checks_are_shared_between_models(self) -> None:
+        """Test that each upstream macro is only checked once per analysis pass."""
+        analyzer = BuildAnalyzer()
+        with patch.object(dbt_parser, "macro_changed", return_value=True) as mock_changed:
+            analyses = analyzer.analyze_build_execution()
+
+        assert mock_changed.call_args_list == [call("simple_macro")]
+        assert analyses["orders"].needs_execution
+        assert any(r.code == "UPSTREAM_MACROS_CHANGED" for r in analyses["orders"].reasons)
+        # The per pass cache does not outlive the analysis
+        assert analyzer._macro_changed_cache is None
+
+    def test_without_reasons_stops_at_first_reason(self) -> None:
+        """Test that only the first reason is collected when reasons are not needed."""
+        analyzer = BuildAnalyzer()
+        with (
+            patch.object(analyzer, "_model_is_fresh", return_value=False),
+            patch.object(dbt_parser, "macro_changed", return_value=True) as mock_changed,
+        ):
+            full = analyzer.analyze_model_execution(dbt_parser.models["customer_orders"])
+            fast = analyzer.analyze_model_execution(
+                dbt_parser.models["customer_orders"],
+                needs_reasons=False,
+            )
+            mock_changed.reset_mock()
+            analyses = analyzer.analyze_build_execution(needs_reasons=False)
+
+        assert [r.code for r in full.reasons] == [
+            "MODEL_STALE",
+            "UPSTREAM_MODELS_CHANGED",
+            "UPSTREAM_MACROS_CHANGED",
+        ]
+        assert fast.needs_execution
+        assert [r.code for r in fast.reasons] == ["MODEL_STALE"]
+        assert all(len(a.reasons) <= 1 for a in analyses.values())
+
+    def test_print_execution_analysis_writes_once(self) -> None:
+        """Test that the verbose analysis summary is written out in a single call."""
+        analyzer = BuildAnalyzer()
+        analyses = analyzer.analyze_build_execution()
+        with patch("dbt_toolbox.utils.printer.typer.echo") as mock_echo:
+            analyzer.print_execution_analysis(analyses, verbose=True)
+
+        mock_echo.assert_called_once()
+        output = mock_echo.call_args[0][0]
+        assert "Build Execution Analysis" in output
+        assert all(f"• {name}" in output for name in analyses)
+
+    def test_unchanged_fresh_project_is_not_analyzed(self) -> None:
+        """Test the early return when the project is unchanged since it was found fresh."""
+        analyzer = BuildAnalyzer()
+        last_manifest = dbt_parser.cache.cache_last_manifest
+        fresh_until = EXECUTION_TIMESTAMP + timedelta(minutes=5)
+        try:
+            last_manifest.write((dbt_parser.manifest_hash, fresh_until))
+            with patch.object(analyzer, "analyze_model_execution") as mock_analyze:
+                analyses = analyzer.analyze_build_execution()
+                mock_analyze.assert_not_called()
+            assert set(analyses) == set(dbt_parser.models)
+            assert not any(a.needs_execution for a in analyses.values())
+
+            # A selection, a changed project or an expired cache are always analyzed
+            assert analyzer.analyze_build_execution("customers")["customers"].needs_execution
+            last_manifest.write(("changed", fresh_until))
+            assert analyzer.analyze_build_execution()["customers"].needs_execution
+            last_manifest.write((dbt_parser.manifest_hash, EXECUTION_TIMESTAMP - timedelta(1)))
+            assert analyzer.analyze_build_execution()["customers"].needs_execution
+        finally:
+            last_manifest.clear()
@@ -46,3 +46,20 @@ def test_macro_cache_validation() -> None:
     cache = Cache()
     assert not cache._validate_macro_cache()
     assert cache._validate_macro_cache()
+
+
+def test_cache_of_other_version_is_dropped() -> None:
+    """Test that a cache written with another cache version is removed."""
+    cache_path = Cache().cache_path
+    stale_file = cache_path / "stale.cache"
+    stale_file.write_bytes(b"")
+    assert Cache().cache_path.exists()
+    assert stale_file.exists()
+
+    (cache_path / "cache_version").write_text("0")
+    cache = Cache()
+    assert cache.cache_path.exists()
+    assert not stale_file.exists()
+    # Recreate the folders other cache instances expect
+    assert cache.cache_models_path.exists()
+    assert cache.cache_jinja_bytecode_path.exists()
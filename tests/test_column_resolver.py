@@ -1,17 +1,30 @@
 """Tests for column resolution functionality."""
 
+from functools import cache
+from unittest.mock import patch
+
+import pytest
 import sqlglot
 
-from dbt_toolbox.column_resolver import ColumnReference, TableType, resolve_column_lineage
+from dbt_toolbox import column_resolver
+from dbt_toolbox.column_resolver import (
+    ColumnReference,
+    TableType,
+    _clean_tbl_name,
+    resolve_column_lineage,
+    resolve_column_lineage_cached,
+)
+
+
+@cache
+def _parse(sql: str, dialect: str) -> sqlglot.Expression:
+    """Parse sql once per interpreter, the resolver does not modify the tree."""
+    return sqlglot.parse_one(sql, dialect=dialect)
 
 
 def _convert_to_legacy_dict(column_refs: list[ColumnReference]) -> dict[str, str | None]:
     """Convert new ColumnReference list to legacy dict format for existing tests."""
-    result = {}
-    for ref in column_refs:
-        if ref.reference_type == TableType.EXTERNAL:
-            result[ref.name] = ref.table
-    return result
+    return {ref.name: ref.table for ref in column_refs if ref.reference_type is TableType.EXTERNAL}
 
 
 def _assert_column_references_match(
@@ -42,82 +55,28 @@ def _assert_column_references_match(
         assert actual_tuple in expected_set, f"Unexpected reference found: {actual_ref}"
 
 
-class TestColumnResolver:
-    """Test column lineage resolution."""
-
-    def test_simple_select_no_joins(self) -> None:
-        """Test simple SELECT without joins."""
-        sql = """
+# Queries whose external column references are checked as a name to table mapping
+EXTERNAL_LINEAGE_CASES = [
+    # Simple SELECT without joins.
+    pytest.param(
+        """
         SELECT
             customer_id,
             name,
             email
         FROM customers
-        """
-
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-
-        expected = {
+        """,
+        "duckdb",
+        {
             "customer_id": "customers",
             "name": "customers",
             "email": "customers",
-        }
-        assert result == expected
-
-    def test_simple_join_with_aliases(self) -> None:
-        """Test simple join with table aliases."""
-        sql = """
-        SELECT
-            c.customer_id,
-            c.full_name,
-            o.order_id,
-            o.ordered_at
-        FROM customers c
-        LEFT JOIN orders o ON c.customer_id = o.customer_id
+        },
+        id="simple_select_no_joins",
+    ),
+    # Complex join with dbt naming convention.
+    pytest.param(
         """
-
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-
-        expected_refs = [
-            ColumnReference(
-                id=1,
-                name="customer_id",
-                table="customers",
-                reference_type=TableType.EXTERNAL,
-                resolved=None,
-            ),
-            ColumnReference(
-                id=2,
-                name="full_name",
-                table="customers",
-                reference_type=TableType.EXTERNAL,
-                resolved=None,
-            ),
-            ColumnReference(
-                id=3,
-                name="order_id",
-                table="orders",
-                reference_type=TableType.EXTERNAL,
-                resolved=None,
-            ),
-            ColumnReference(
-                id=4,
-                name="ordered_at",
-                table="orders",
-                reference_type=TableType.EXTERNAL,
-                resolved=None,
-            ),
-        ]
-
-        # Check reference types and resolution status
-        _assert_column_references_match(column_refs, expected_refs)
-
-    def test_complex_join_with_dbt_naming(self) -> None:
-        """Test complex join with dbt naming convention."""
-        sql = """
         SELECT
             "___source___inventory__products___"."id" as "product_id",
             "cat"."name" as "category_name",
@@ -128,22 +87,18 @@ class TestColumnResolver:
         LEFT JOIN
             "___source___inventory__categories___" as "cat"
             ON "___source___inventory__products___"."category_id" = "cat"."id"
-        """
-
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-
-        expected = {
+        """,
+        "duckdb",
+        {
             "id": "inventory__products",
             "name": "inventory__categories",
             "department": "inventory__categories",
-        }
-        assert result == expected
-
-    def test_function_expressions_with_table_references(self) -> None:
-        """Test function expressions that reference columns from specific tables."""
-        sql = """
+        },
+        id="complex_join_with_dbt_naming",
+    ),
+    # Function expressions that reference columns from specific tables.
+    pytest.param(
+        """
         SELECT
             from_big_endian_64(
                 xxhash64(
@@ -161,22 +116,18 @@ class TestColumnResolver:
         LEFT JOIN
             "___source___inventory__categories___" as "cat"
             ON "___source___inventory__products___"."category_id" = "cat"."id"
-        """
-
-        parsed = sqlglot.parse_one(sql, dialect="athena")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-
-        expected = {
+        """,
+        "athena",
+        {
             "id": "inventory__products",  # First column ref found in expression
             "name": "inventory__categories",
             "department": "inventory__categories",
-        }
-        assert result == expected
-
-    def test_multiple_joins(self) -> None:
-        """Test query with multiple joins."""
-        sql = """
+        },
+        id="function_expressions_with_table_references",
+    ),
+    # Query with multiple joins.
+    pytest.param(
+        """
         SELECT
             c.customer_id,
             o.order_id,
@@ -186,85 +137,62 @@ class TestColumnResolver:
         LEFT JOIN orders o ON c.customer_id = o.customer_id
         LEFT JOIN products p ON o.product_id = p.product_id
         LEFT JOIN stores s ON o.store_id = s.store_id
-        """
-
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-
-        expected = {
+        """,
+        "duckdb",
+        {
             "customer_id": "customers",
             "order_id": "orders",
             "product_name": "products",
             "store_name": "stores",
-        }
-        assert result == expected
-
-    def test_self_join(self) -> None:
-        """Test self-join with different aliases."""
-        sql = """
+        },
+        id="multiple_joins",
+    ),
+    # Self-join with different aliases.
+    pytest.param(
+        """
         SELECT
             mgr.name as manager_name,
             emp.name as employee_name
         FROM employees mgr
         LEFT JOIN employees emp ON mgr.employee_id = emp.manager_id
-        """
-
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-
-        expected = {
+        """,
+        "duckdb",
+        {
             "name": "employees",
-        }
-        assert result == expected
-
-    def test_columns_without_table_prefix(self) -> None:
-        """Test columns without explicit table prefix in join context."""
-        sql = """
+        },
+        id="self_join",
+    ),
+    # Columns without explicit table prefix in join context.
+    pytest.param(
+        """
         SELECT
             customer_id,  -- Ambiguous column
             c.name,
             o.order_total
         FROM customers c
         LEFT JOIN orders o ON c.customer_id = o.customer_id
-        """
-
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-
-        expected = {
+        """,
+        "duckdb",
+        {
             "name": "customers",
             "order_total": "orders",
-        }
-        assert result == expected
-
-    def test_empty_select(self) -> None:
-        """Test empty or None SQLGlot object."""
-        column_refs = resolve_column_lineage(None)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-        assert result == {}
-
-    def test_select_star(self) -> None:
-        """Test SELECT * query."""
-        sql = """
+        },
+        id="columns_without_table_prefix",
+    ),
+    # SELECT * query.
+    pytest.param(
+        """
         SELECT *
         FROM customers c
         LEFT JOIN orders o ON c.customer_id = o.customer_id
+        """,
+        "duckdb",
+        {},  # SELECT * creates a Star expression, not individual columns
+        id="select_star",
+    ),
+    # Subquery in FROM clause.
+    pytest.param(
         """
-
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-
-        # SELECT * creates a Star expression, not individual columns
-        expected = {}  # Can't resolve SELECT *
-        assert result == expected
-
-    def test_subquery_in_from(self) -> None:
-        """Test subquery in FROM clause."""
-        sql = """
         SELECT
             sub.customer_id,
             sub.order_count,
@@ -275,21 +203,17 @@ class TestColumnResolver:
             GROUP BY customer_id
         ) sub
         LEFT JOIN customers c ON sub.customer_id = c.customer_id
-        """
-
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
-        column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
-
-        expected = {
+        """,
+        "duckdb",
+        {
             "customer_id": "orders",  # From subquery alias
             "name": "customers",
-        }
-        assert result == expected
-
-    def test_cte_columns(self) -> None:
-        """Test subquery from within a CTE."""
-        sql = """
+        },
+        id="subquery_in_from",
+    ),
+    # Subquery from within a CTE.
+    pytest.param(
+        """
         with my_cte as (
             select
                 a,
@@ -300,17 +224,81 @@ class TestColumnResolver:
             c,
             d
         from my_cte
+        """,
+        "duckdb",
+        {
+            "a": "tbl",
+            "b": "tbl",
+        },
+        id="cte_columns",
+    ),
+]
+
+
+@pytest.mark.parametrize(("sql", "dialect", "expected"), EXTERNAL_LINEAGE_CASES)
+def test_external_lineage(sql: str, dialect: str, expected: dict[str, str | None]) -> None:
+    """Test the resolved source table of each external column."""
+    column_refs = resolve_column_lineage(_parse(sql, dialect))  # type: ignore
+    assert _convert_to_legacy_dict(column_refs) == expected
+
+
+class TestColumnResolver:
+    """Test column lineage resolution."""
+
+    def test_simple_join_with_aliases(self) -> None:
+        """Test simple join with table aliases."""
+        sql = """
+        SELECT
+            c.customer_id,
+            c.full_name,
+            o.order_id,
+            o.ordered_at
+        FROM customers c
+        LEFT JOIN orders o ON c.customer_id = o.customer_id
         """
 
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
+        parsed = _parse(sql, "duckdb")
         column_refs = resolve_column_lineage(parsed)  # type: ignore
-        result = _convert_to_legacy_dict(column_refs)
 
-        expected = {
-            "a": "tbl",
-            "b": "tbl",
-        }
-        assert result == expected
+        expected_refs = [
+            ColumnReference(
+                id=1,
+                name="customer_id",
+                table="customers",
+                reference_type=TableType.EXTERNAL,
+                resolved=None,
+            ),
+            ColumnReference(
+                id=2,
+                name="full_name",
+                table="customers",
+                reference_type=TableType.EXTERNAL,
+                resolved=None,
+            ),
+            ColumnReference(
+                id=3,
+                name="order_id",
+                table="orders",
+                reference_type=TableType.EXTERNAL,
+                resolved=None,
+            ),
+            ColumnReference(
+                id=4,
+                name="ordered_at",
+                table="orders",
+                reference_type=TableType.EXTERNAL,
+                resolved=None,
+            ),
+        ]
+
+        # Check reference types and resolution status
+        _assert_column_references_match(column_refs, expected_refs)
+
+    def test_empty_select(self) -> None:
+        """Test empty or None SQLGlot object."""
+        column_refs = resolve_column_lineage(None)  # type: ignore
+        result = _convert_to_legacy_dict(column_refs)
+        assert result == {}
 
     def test_subquery_cte_columns(self) -> None:
         """Test subquery from within a CTE."""
@@ -328,7 +316,7 @@ class TestColumnResolver:
         from tbl
         """
 
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
+        parsed = _parse(sql, "duckdb")
         column_refs = resolve_column_lineage(parsed)  # type: ignore
         expected_refs = [
             ColumnReference(
@@ -390,7 +378,7 @@ class TestColumnResolver:
         LEFT JOIN customers c ON sub.customer_id = c.customer_id
         """
 
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
+        parsed = _parse(sql, "duckdb")
         column_refs = resolve_column_lineage(parsed)  # type: ignore
         expected_refs = [
             ColumnReference(
@@ -455,7 +443,7 @@ class TestColumnResolver:
         select c, b from my_cte
         """
 
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
+        parsed = _parse(sql, "duckdb")
         column_refs = resolve_column_lineage(parsed)  # type: ignore
         expected_refs = [
             ColumnReference(
@@ -507,7 +495,7 @@ class TestColumnResolver:
         select d, b from second_cte
         """
 
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
+        parsed = _parse(sql, "duckdb")
         column_refs = resolve_column_lineage(parsed)  # type: ignore
         expected_refs = [
             ColumnReference(
@@ -568,7 +556,7 @@ class TestColumnResolver:
         select hey, a, b from my_cte
         """
 
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
+        parsed = _parse(sql, "duckdb")
         column_refs = resolve_column_lineage(parsed)  # type: ignore
         expected_refs = [
             ColumnReference(
@@ -632,7 +620,7 @@ class TestColumnResolver:
             ) as g
         from tbl
         """
-        parsed = sqlglot.parse_one(sql, dialect="duckdb")
+        parsed = _parse(sql, "duckdb")
         column_refs = resolve_column_lineage(parsed)  # type: ignore
         expected_refs = [
             ColumnReference(
@@ -677,3 +665,39 @@ class TestColumnResolver:
             ),
         ]
         _assert_column_references_match(column_refs, expected_refs)
+
+
+def test_resolve_column_lineage_cached() -> None:
+    """Test that lineage is only resolved once per distinct expression."""
+    sql = "select a, b from cached_lineage_tbl"
+    with patch.object(
+        column_resolver,
+        "resolve_column_lineage",
+        wraps=resolve_column_lineage,
+    ) as mock_resolve:
+        first = resolve_column_lineage_cached(sqlglot.parse_one(sql, dialect="duckdb"))
+        # An equal tree parsed separately hits the cache
+        second = resolve_column_lineage_cached(
+            sqlglot.parse_one("SELECT a, b FROM cached_lineage_tbl", dialect="duckdb")
+        )
+        resolve_column_lineage_cached(sqlglot.parse_one(sql + " where a = 1", dialect="duckdb"))
+
+    assert mock_resolve.call_count == 2
+    assert first == second
+    assert first is not second
+    assert [ref.name for ref in first] == ["a", "b"]
+
+
+def test_clean_tbl_name() -> None:
+    """Test that rendered ref and source names are cleaned to the referenced name."""
+    assert _clean_tbl_name("___ref___orders___") == "orders"
+    assert _clean_tbl_name("___ref___orders____") == "orders_"
+    assert _clean_tbl_name("___ref____orders___") == "_orders"
+    assert _clean_tbl_name("___source___raw__orders___") == "raw__orders"
+    assert _clean_tbl_name("orders") == "orders"
+
+
+def test_rust_tokenizer_is_installed() -> None:
+    """Test that sqlglot tokenizes with the sqlglotrs extension from the rs extra."""
+    pytest.importorskip("sqlglotrs")
+    assert sqlglot.tokens.USE_RS_TOKENIZER
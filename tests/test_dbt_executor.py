@@ -135,7 +135,7 @@ class TestDbtExecutor:
         )
 
         # Should analyze, print results, and execute with filtered selection
-        mock_analyze.assert_called_once_with("customers+")
+        mock_analyze.assert_called_once_with("customers+", needs_reasons=False)
         mock_print_analysis.assert_called_once()
         mock_execute.assert_called_once()
 
@@ -173,7 +173,7 @@ class TestDbtExecutor:
         )
 
         # Should analyze, print results, and execute
-        mock_analyze.assert_called_once_with("customers+")
+        mock_analyze.assert_called_once_with("customers+", needs_reasons=False)
         mock_print_analysis.assert_called_once()
         mock_execute.assert_called_once()
 
@@ -207,7 +207,7 @@ class TestDbtExecutor:
         )
 
         # Should analyze but not execute anything
-        mock_analyze.assert_called_once_with("customers+")
+        mock_analyze.assert_called_once_with("customers+", needs_reasons=False)
         mock_execute.assert_not_called()
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
@@ -257,7 +257,7 @@ class TestDbtExecutor:
         )
 
         # Should analyze and print but not execute
-        mock_analyze.assert_called_once_with("customers")
+        mock_analyze.assert_called_once_with("customers", needs_reasons=False)
         mock_print_analysis.assert_called_once()
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
@@ -1,5 +1,8 @@
 """Test dbt parser."""
 
+import yamlium
+
+from dbt_toolbox._yaml import parse_yaml
 from dbt_toolbox.dbt_parser.dbt_parser import dbtParser
 
 
@@ -8,3 +11,42 @@ def test_load_models() -> None:
     dbt = dbtParser()
     assert dbt.models["customers"].name == "customers"
     assert dbt.models["customers"].final_columns == ["customer_id", "full_name"]
+    assert dbt.model_names == frozenset(dbt.models)
+
+
+def test_yaml_docs_match_yamlium() -> None:
+    """Test that the fast yaml loader reads docs the same way as yamlium."""
+    dbt = dbtParser()
+    docs = dbt.yaml_docs["orders"]
+    expected = yamlium.parse(docs.path).to_dict()["models"][0]
+    assert docs.model_description == expected["description"]
+    assert not docs.model_description.endswith("\n")  # type: ignore[union-attr]
+    assert [c.name for c in docs.columns] == [c["name"] for c in expected["columns"]]
+
+
+def test_parse_yaml_types_scalars_like_yamlium() -> None:
+    """Test that scalars and merge keys are read the same way as yamlium, not by YAML 1.1."""
+    text = (
+        "a: yes\nb: on\nc: 2024-01-01\nd: 010\ne: 1e3\nf: true\ng: null\nh:\ni: '010'\n"
+        "j: [1, no, 1.5]\n"
+    )
+    parsed = parse_yaml(text)
+    assert parsed == yamlium.parse(text).to_dict()
+    assert parsed == {
+        "a": "yes",
+        "b": "on",
+        "c": "2024-01-01",
+        "d": 10,
+        "e": 1000.0,
+        "f": True,
+        "g": None,
+        "h": None,
+        "i": "010",
+        "j": [1, "no", 1.5],
+    }
+
+    # Merge keys are resolved, like yamlium does
+    text = "defaults: &defaults\n  type: duckdb\n  threads: 4\ndev:\n  <<: *defaults\n  path: a\n"
+    parsed = parse_yaml(text)
+    assert parsed == yamlium.parse(text).to_dict()
+    assert parsed["dev"] == {"type": "duckdb", "threads": 4, "path": "a"}
@@ -1,8 +1,38 @@
 """Module for testing jinja rendering."""
 
-from dbt_toolbox.dbt_parser._jinja_handler import jinja
+from unittest.mock import patch
+
+from jinja2 import Environment
+
+from dbt_toolbox.dbt_parser._jinja_handler import _build_jinja_env, jinja
 
 
 def test_jinja_simple_render() -> None:
     """Test a very simple jinja render."""
     assert jinja.render("pytest {{ simple_macro() }}") == "pytest \n'A simple macro'\n"
+
+
+def test_macros_are_compiled_once() -> None:
+    """Test that compiled macros are reused from the bytecode cache."""
+    _build_jinja_env()
+    with patch.object(
+        Environment,
+        "compile",
+        autospec=True,
+        side_effect=Environment.compile,
+    ) as mock_compile:
+        env = _build_jinja_env()
+    # Only non macro templates, such as the dbt_project.yml, are compiled
+    assert all("{% macro" not in c.args[1] for c in mock_compile.call_args_list)
+    assert env.from_string("{{ simple_macro() }}").render() == "\n'A simple macro'\n"
+
+
+def test_render_and_parse_are_cached() -> None:
+    """Test that identical sql is only rendered and parsed once."""
+    sql = "select {{ simple_macro() }} as cached_render"
+    first = jinja.render(sql)
+    parsed = jinja.parse(sql)
+    with patch.object(jinja.env, "from_string") as mock_from_string:
+        assert jinja.render(sql) == first
+        assert jinja.parse(sql) is parsed
+    mock_from_string.assert_not_called()
@@ -1,44 +1,60 @@
 """Tests for the run command."""
 
+from collections.abc import Iterator
 from unittest.mock import Mock, patch
 
+import pytest
+from click.testing import Result
 from typer.testing import CliRunner
 
 from dbt_toolbox.cli.main import app
+from dbt_toolbox.cli.run import run
+
+
+@pytest.fixture(scope="module")
+def cli_runner() -> CliRunner:
+    """A CLI runner shared by all tests in the module."""
+    return CliRunner()
+
+
+@pytest.fixture(scope="module")
+def app_help(cli_runner: CliRunner) -> Result:
+    """The rendered help of the app."""
+    return cli_runner.invoke(app, ["--help"])
+
+
+@pytest.fixture(scope="module")
+def run_help(cli_runner: CliRunner) -> Result:
+    """The rendered help of the run command."""
+    return cli_runner.invoke(app, ["run", "--help"])
 
 
 class TestRunCommand:
     """Test the dt run command."""
 
-    def test_run_command_exists(self) -> None:
-        """Test that the run command is registered in the CLI app."""
-        cli_runner = CliRunner()
-        result = cli_runner.invoke(app, ["--help"])
+    @pytest.fixture(autouse=True)
+    def mock_validate(self) -> Iterator[Mock]:
+        """Let the lineage validation pass."""
+        with patch(
+            "dbt_toolbox.cli._dbt_executor._validate_lineage_references",
+            return_value=True,
+        ) as mock:
+            yield mock
 
-        assert result.exit_code == 0
-        assert "run" in result.stdout
+    def test_run_command_exists(self, app_help: Result) -> None:
+        """Test that the run command is registered in the CLI app."""
+        assert app_help.exit_code == 0
+        assert "run" in app_help.stdout
 
-    def test_run_command_help(self) -> None:
+    def test_run_command_help(self, run_help: Result) -> None:
         """Test that the run command shows help correctly."""
-        cli_runner = CliRunner()
-        result = cli_runner.invoke(app, ["run", "--help"])
-
         # Should exit successfully after showing help
-        assert result.exit_code == 0
+        assert run_help.exit_code == 0
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    @patch("dbt_toolbox.cli._dbt_executor._validate_lineage_references")
-    def test_run_with_model_selection(self, mock_validate: Mock, mock_execute: Mock) -> None:
+    def test_run_with_model_selection(self, mock_execute: Mock) -> None:
         """Test run command with model selection."""
-        # Mock lineage validation to pass
-        mock_validate.return_value = True
-        # Mock execute_dbt_command to simulate successful execution
-        cli_runner = CliRunner()
-
-        result = cli_runner.invoke(app, ["run", "--model", "customers"])
-
-        # Should exit successfully
-        assert result.exit_code == 0
+        run(model="customers")
 
         # Should call dbt run with the model selection
         mock_execute.assert_called_once()
@@ -48,14 +64,8 @@ class TestRunCommand:
         assert "customers" in called_args
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    @patch("dbt_toolbox.cli._dbt_executor._validate_lineage_references")
-    def test_run_with_select_option(self, mock_validate: Mock, mock_execute: Mock) -> None:
+    def test_run_with_select_option(self, mock_execute: Mock, cli_runner: CliRunner) -> None:
         """Test run command with --select option."""
-        # Mock lineage validation to pass
-        mock_validate.return_value = True
-        # Mock execute_dbt_command to simulate successful execution
-        cli_runner = CliRunner()
-
         result = cli_runner.invoke(app, ["run", "--select", "orders"])
 
         assert result.exit_code == 0
@@ -68,14 +78,8 @@ class TestRunCommand:
         assert "orders" in called_args
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    @patch("dbt_toolbox.cli._dbt_executor._validate_lineage_references")
-    def test_run_without_model_selection(self, mock_validate: Mock, mock_execute: Mock) -> None:
+    def test_run_without_model_selection(self, mock_execute: Mock, cli_runner: CliRunner) -> None:
         """Test run command without model selection."""
-        # Mock lineage validation to pass
-        mock_validate.return_value = True
-        # Mock execute_dbt_command to simulate successful execution
-        cli_runner = CliRunner()
-
         result = cli_runner.invoke(app, ["run"])
 
         assert result.exit_code == 0
@@ -86,17 +90,10 @@ class TestRunCommand:
         assert called_args[:2] == ["dbt", "run"]
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    @patch("dbt_toolbox.cli._dbt_executor._validate_lineage_references")
-    def test_run_with_additional_args(self, mock_validate: Mock, mock_execute: Mock) -> None:
+    def test_run_with_additional_args(self, mock_execute: Mock) -> None:
         """Test that additional arguments are passed through."""
-        # Mock lineage validation to pass
-        mock_validate.return_value = True
-        # Mock execute_dbt_command to simulate successful execution
-        cli_runner = CliRunner()
-
-        result = cli_runner.invoke(app, ["run", "--threads", "4", "--full-refresh"])
+        run(threads=4, full_refresh=True)
 
-        assert result.exit_code == 0
         mock_execute.assert_called_once()
 
         # Check that both --threads and --full-refresh are passed through
@@ -107,17 +104,10 @@ class TestRunCommand:
         assert "--full-refresh" in called_args
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    @patch("dbt_toolbox.cli._dbt_executor._validate_lineage_references")
-    def test_run_with_target_option(self, mock_validate: Mock, mock_execute: Mock) -> None:
+    def test_run_with_target_option(self, mock_execute: Mock) -> None:
         """Test run command with --target option."""
-        # Mock lineage validation to pass
-        mock_validate.return_value = True
-        # Mock execute_dbt_command to simulate successful execution
-        cli_runner = CliRunner()
-
-        result = cli_runner.invoke(app, ["run", "--target", "prod", "--model", "customers"])
+        run(target="prod", model="customers")
 
-        assert result.exit_code == 0
         mock_execute.assert_called_once()
 
         # Check that --target is passed through to dbt command
@@ -129,17 +119,10 @@ class TestRunCommand:
         assert "customers" in called_args
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    @patch("dbt_toolbox.cli._dbt_executor._validate_lineage_references")
-    def test_run_without_target_option(self, mock_validate: Mock, mock_execute: Mock) -> None:
+    def test_run_without_target_option(self, mock_execute: Mock) -> None:
         """Test run command without --target option."""
-        # Mock lineage validation to pass
-        mock_validate.return_value = True
-        # Mock execute_dbt_command to simulate successful execution
-        cli_runner = CliRunner()
+        run(model="customers")
 
-        result = cli_runner.invoke(app, ["run", "--model", "customers"])
-
-        assert result.exit_code == 0
         mock_execute.assert_called_once()
 
         # Check that --target is NOT in the command when not provided
@@ -150,13 +133,9 @@ class TestRunCommand:
         assert "customers" in called_args
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    @patch("dbt_toolbox.cli._dbt_executor._validate_lineage_references")
-    def test_run_dbt_not_found(self, mock_validate: Mock, mock_execute: Mock) -> None:
+    def test_run_dbt_not_found(self, mock_execute: Mock, cli_runner: CliRunner) -> None:
         """Test error handling when dbt command is not found."""
-        # Mock lineage validation to pass
-        mock_validate.return_value = True
         mock_execute.side_effect = SystemExit(1)
-        cli_runner = CliRunner()
 
         result = cli_runner.invoke(app, ["run"])
 
@@ -164,10 +143,9 @@ class TestRunCommand:
         assert result.exit_code == 1
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    def test_run_exit_code_passthrough(self, mock_execute: Mock) -> None:
+    def test_run_exit_code_passthrough(self, mock_execute: Mock, cli_runner: CliRunner) -> None:
         """Test that dbt's exit code is passed through when smart execution is disabled."""
         mock_execute.side_effect = SystemExit(2)
-        cli_runner = CliRunner()
 
         result = cli_runner.invoke(app, ["run", "--model", "nonexistent", "--disable-smart"])
 
@@ -175,13 +153,9 @@ class TestRunCommand:
         assert result.exit_code == 2
 
     @patch("dbt_toolbox.cli._dbt_executor.execute_dbt_command")
-    @patch("dbt_toolbox.cli._dbt_executor._validate_lineage_references")
-    def test_run_keyboard_interrupt(self, mock_validate: Mock, mock_execute: Mock) -> None:
+    def test_run_keyboard_interrupt(self, mock_execute: Mock, cli_runner: CliRunner) -> None:
         """Test handling of keyboard interrupt."""
-        # Mock lineage validation to pass
-        mock_validate.return_value = True
         mock_execute.side_effect = SystemExit(130)
-        cli_runner = CliRunner()
 
         result = cli_runner.invoke(app, ["run"])
 